@@ -5,32 +5,54 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import (
-    config_validation as cv,
-    device_registry as dr,
-    entity_registry as er,
+from homeassistant.const import Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import (
+    ConfigEntryNotReady,
+    HomeAssistantError,
+    ServiceValidationError,
 )
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util.read_only_dict import ReadOnlyDict
 
-from . import frontend
-from .const import DOMAIN, REMOTE_COMMANDS
+from . import frontend, websocket
+from .cache import NeoSmartboxCache
+from .const import (
+    DATA_LOGO_CACHE,
+    DATA_TARGET_INDEX,
+    DATA_TRANSPORT,
+    DOMAIN,
+    REMOTE_COMMANDS,
+)
 from .coordinator import NeoSmartboxUpdateCoordinator
+from .dispatcher import async_fan_out
+from .logos import LogoCache, LogoView
+from .sequence import ATTR_SEQUENCE, SEQUENCE_SCHEMA, compile_sequence
+from .targets import TargetIndex
+from .transport import NeoSmartboxTransport
 
 _LOGGER = logging.getLogger(__name__)
 
 # Add device_action platform
-PLATFORMS: list[Platform] = [Platform.REMOTE]
+PLATFORMS: list[Platform] = [Platform.MEDIA_PLAYER, Platform.REMOTE, Platform.SENSOR]
 
 CONFIG_SCHEMA = cv.removed(DOMAIN, raise_if_present=False)
 
 REMOTE_KEY_ACTION = "remote_key_action"
 NAVIGATE_TO_LIVE_CHANNEL = "navigate_to_live_channel"
 NAVIGATE_TO_CUSTOM_ACTION = "navigate_to_custom_action"
+RUN_SEQUENCE = "run_sequence"
+STOP_SEQUENCE = "stop_sequence"
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -38,6 +60,19 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     # Initialize the domain data if not already there
     hass.data.setdefault(DOMAIN, {})
 
+    # Connections and the request budget are shared by all accounts
+    hass.data[DATA_TRANSPORT] = NeoSmartboxTransport(hass)
+
+    target_index = hass.data[DATA_TARGET_INDEX] = TargetIndex(hass)
+    target_index.async_setup()
+
+    websocket.async_setup(hass)
+    _async_register_services(hass)
+
+    logo_cache = hass.data[DATA_LOGO_CACHE] = LogoCache(hass)
+    await logo_cache.async_load()
+    hass.http.register_view(LogoView(logo_cache))
+
     await frontend.async_setup(hass)
 
     return True
@@ -47,80 +82,32 @@ def get_devices_from_target(
     hass: HomeAssistant, data: ReadOnlyDict[str, Any]
 ) -> list[str]:
     """Get devices from target."""
+    return hass.data[DATA_TARGET_INDEX].resolve(data)
 
-    device_registry = dr.async_get(hass)
-    entity_registry = er.async_get(hass)
-
-    ha_device_ids = data.get("device_id", [])
-
-    for entity_id in data.get("entity_id", []):
-        entry = entity_registry.async_get(entity_id)
-
-        if not entry:
-            _LOGGER.error("Entity not found in entity registry")
-            continue
-
-        ha_device_id = entry.device_id
-        if not ha_device_id:
-            _LOGGER.error("Device ID not found in entity registry")
-            continue
-
-        ha_device_ids.append(ha_device_id)
-
-    for label_id in data.get("label_id", []):
-        ha_devices = device_registry.devices.get_devices_for_label(label_id)
-
-        device_ids = [
-            device.id for device in ha_devices if device.id not in ha_device_ids
-        ]
-
-        ha_device_ids.extend(device_ids)
-
-    for area_id in data.get("area_id", []):
-        ha_devices = device_registry.devices.get_devices_for_area_id(area_id)
-
-        device_ids = [
-            device.id for device in ha_devices if device.id not in ha_device_ids
-        ]
-
-        ha_device_ids.extend(device_ids)
-
-    box_device_ids = []
-
-    for device_id in ha_device_ids:
-        device = device_registry.async_get(device_id)
 
-        if not device:
-            _LOGGER.error("Device not found in device registry")
-            continue
+def get_coordinator(
+    hass: HomeAssistant, box_device_id: str
+) -> NeoSmartboxUpdateCoordinator:
+    """Get the coordinator of the account a device belongs to."""
+    if not (coordinator := hass.data[DATA_TARGET_INDEX].coordinator(box_device_id)):
+        raise HomeAssistantError(f"No NEO account found for device {box_device_id}")
+    return coordinator
 
-        _, box_device_id = next(iter(device.identifiers))
 
-        if box_device_id not in box_device_ids:
-            box_device_ids.append(box_device_id)
+def _service_response(
+    call: ServiceCall, results: dict[str, dict[str, Any]]
+) -> ServiceResponse:
+    """Return the per-device results if the caller asked for them."""
+    if not call.return_response:
+        return None
+    return {"results": results}
 
-    return box_device_ids
 
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the services, which route each device to its account."""
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up NEO Smartbox from a config entry."""
-    # Initialize runtime_data if not already set
-
-    api_key = entry.data[CONF_API_KEY]
-
-    coordinator = NeoSmartboxUpdateCoordinator(hass, api_key)
-
-    entry.runtime_data = coordinator
-
-    await coordinator.async_config_entry_first_refresh()
-
-    if not coordinator.data:
-        raise ConfigEntryNotReady("No devices found")
-
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
-
-    # Register device actions service
-    async def handle_remote_key_action(call: ServiceCall) -> None:
+    async def handle_remote_key_action(call: ServiceCall) -> ServiceResponse:
         """Handle the custom action service."""
 
         action_type: str | None = call.data.get("action", None)
@@ -129,88 +116,189 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         if not action_type:
             _LOGGER.error("Action type not found")
-            return
+            return _service_response(call, {})
 
         box_device_ids = get_devices_from_target(hass, call.data)
 
-        for box_device_id in box_device_ids:
-            if not box_device_id:
-                _LOGGER.error("Device not found in device registry")
-                return
-
-            await coordinator.api_client.send_key_action(
+        results = await async_fan_out(
+            box_device_ids,
+            lambda box_device_id: get_coordinator(hass, box_device_id).async_send_key(
                 device_id=box_device_id,
                 key_name=REMOTE_COMMANDS[action_type],
                 long_press=long_press,
                 key_repeat=0,
-            )
+            ),
+        )
+
+        return _service_response(call, results)
 
-    async def handle_navigate_to_custom_action(call: ServiceCall) -> None:
+    async def handle_navigate_to_custom_action(call: ServiceCall) -> ServiceResponse:
         """Handle the navigation to provided action."""
 
         action_type: str | None = call.data.get("action", None)
 
         if not action_type:
             _LOGGER.error("Action type not found")
-            return
+            return _service_response(call, {})
 
         box_device_ids = get_devices_from_target(hass, call.data)
 
-        for box_device_id in box_device_ids:
-            if not box_device_id:
-                _LOGGER.error("Device not found in device registry")
-                return
-
-            await coordinator.api_client.navigate_action(
+        results = await async_fan_out(
+            box_device_ids,
+            lambda box_device_id: get_coordinator(hass, box_device_id).async_navigate(
                 device_id=box_device_id,
                 action=action_type,
-            )
+            ),
+        )
 
-    async def handle_navigate_to_live_channel(call: ServiceCall) -> None:
+        return _service_response(call, results)
+
+    async def handle_navigate_to_live_channel(call: ServiceCall) -> ServiceResponse:
         """Handle the navigation to provided action."""
 
         channel_id: str | None = call.data.get("channel_id", None)
+        channel_number: str | int | None = call.data.get("channel_number", None)
+        channel_name: str | None = call.data.get("channel_name", None)
 
-        if not channel_id:
+        if not channel_id and channel_number is None and not channel_name:
             _LOGGER.error("Channel ID not found")
-            return
+            return _service_response(call, {})
+
+        async def _async_navigate(box_device_id: str) -> bool:
+            coordinator = get_coordinator(hass, box_device_id)
+            target_channel_id = channel_id
+
+            if not target_channel_id:
+                # Each account has its own line-up
+                channel = await coordinator.async_resolve_channel(
+                    number=channel_number, name=channel_name
+                )
+                if not channel:
+                    raise HomeAssistantError(
+                        f"Channel not found: {channel_name or channel_number}"
+                    )
+                target_channel_id = channel.id
+
+            return await coordinator.async_navigate(
+                device_id=box_device_id,
+                action=f"app://player/livetv/id/{target_channel_id}",
+            )
 
         box_device_ids = get_devices_from_target(hass, call.data)
 
-        for box_device_id in box_device_ids:
-            if not box_device_id:
-                _LOGGER.error("Device not found in device registry")
-                return
+        results = await async_fan_out(box_device_ids, _async_navigate)
+
+        return _service_response(call, results)
+
+    async def handle_run_sequence(call: ServiceCall) -> ServiceResponse:
+        """Handle running a sequence of remote commands."""
+
+        try:
+            steps = compile_sequence(SEQUENCE_SCHEMA(call.data.get(ATTR_SEQUENCE)))
+        except vol.Invalid as err:
+            raise ServiceValidationError(f"Invalid sequence: {err}") from err
+
+        box_device_ids = get_devices_from_target(hass, call.data)
 
-            await coordinator.api_client.navigate_action(
+        results = await async_fan_out(
+            box_device_ids,
+            lambda box_device_id: get_coordinator(
+                hass, box_device_id
+            ).async_run_sequence(
                 device_id=box_device_id,
-                action=f"app://player/livetv/id/{channel_id}",
+                steps=steps,
+            ),
+        )
+
+        return _service_response(call, results)
+
+    async def handle_stop_sequence(call: ServiceCall) -> ServiceResponse:
+        """Handle stopping running sequences."""
+
+        async def _async_stop(box_device_id: str) -> bool:
+            return get_coordinator(hass, box_device_id).async_stop_sequence(
+                box_device_id
             )
 
+        box_device_ids = get_devices_from_target(hass, call.data)
+
+        results = await async_fan_out(box_device_ids, _async_stop)
+
+        return _service_response(call, results)
+
     hass.services.async_register(
         DOMAIN,
         REMOTE_KEY_ACTION,
         handle_remote_key_action,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
         DOMAIN,
         NAVIGATE_TO_CUSTOM_ACTION,
         handle_navigate_to_custom_action,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     hass.services.async_register(
         DOMAIN,
         NAVIGATE_TO_LIVE_CHANNEL,
         handle_navigate_to_live_channel,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        RUN_SEQUENCE,
+        handle_run_sequence,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        STOP_SEQUENCE,
+        handle_stop_sequence,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up NEO Smartbox from a config entry."""
+    # Initialize runtime_data if not already set
+
+    coordinator = NeoSmartboxUpdateCoordinator(hass, entry)
+
+    entry.runtime_data = coordinator
+
+    if await coordinator.async_load_cache():
+        # Create entities from the cached devices and reconcile in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "neo_smartbox initial refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+        if not coordinator.data:
+            raise ConfigEntryNotReady("No devices found")
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    entry.async_on_unload(
+        coordinator.transport.async_start(coordinator.api_client.circuit_breaker)
+    )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     # Forward entry setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -219,3 +307,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a config entry."""
+    await NeoSmartboxCache(hass, entry.entry_id).async_remove()
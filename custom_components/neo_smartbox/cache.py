@@ -0,0 +1,78 @@
+"""Persistent cache of NEO Smartbox account data."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+from .models import NeoDeviceType, NeoSmartboxDevice, TvChannel
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NeoSmartboxCache:
+    """Keep the last good device and channel lists on disk."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._data: dict[str, Any] = {}
+
+    async def async_load(self) -> None:
+        """Load the cached data from disk."""
+        try:
+            self._data = await self._store.async_load() or {}
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Unable to load cached NEO Smartbox data: %s", err)
+            self._data = {}
+
+    @property
+    def devices(self) -> list[NeoSmartboxDevice]:
+        """Return the cached devices."""
+        try:
+            return [
+                NeoSmartboxDevice(
+                    id=item["id"],
+                    name=item["name"],
+                    type=NeoDeviceType(item["type"]),
+                )
+                for item in self._data.get("devices", [])
+            ]
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid cached devices: %s", err)
+            return []
+
+    @property
+    def channels(self) -> list[TvChannel]:
+        """Return the cached channels."""
+        try:
+            return [
+                TvChannel.from_dict(item) for item in self._data.get("channels", [])
+            ]
+        except (KeyError, TypeError) as err:
+            _LOGGER.warning("Ignoring invalid cached channels: %s", err)
+            return []
+
+    def async_set_devices(self, devices: list[NeoSmartboxDevice]) -> None:
+        """Schedule saving the device list."""
+        self._data["devices"] = [
+            {"id": device.id, "name": device.name, "type": device.type.value}
+            for device in devices
+        ]
+        self._store.async_delay_save(lambda: self._data, STORAGE_SAVE_DELAY)
+
+    def async_set_channels(self, channels: list[TvChannel]) -> None:
+        """Schedule saving the channel list."""
+        self._data["channels"] = [asdict(channel) for channel in channels]
+        self._store.async_delay_save(lambda: self._data, STORAGE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the cache from disk."""
+        await self._store.async_remove()
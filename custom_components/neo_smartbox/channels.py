@@ -0,0 +1,146 @@
+"""Channel lookup index for NEO Smartbox."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+import difflib
+import re
+import unicodedata
+
+from .models import TvChannel
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a channel title for lookups."""
+    decomposed = unicodedata.normalize("NFKD", title.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC.sub("", stripped)
+
+
+class ChannelIndex:
+    """Index of TV channels by id, number, title and group.
+
+    The index is updated incrementally from a new channel list, so only
+    added, changed and removed channels are touched.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._by_id: dict[str, TvChannel] = {}
+        self._by_number: dict[str, TvChannel] = {}
+        self._by_title: dict[str, TvChannel] = {}
+        self._by_group: dict[str, dict[str, TvChannel]] = {}
+        self._favorites: dict[str, TvChannel] = {}
+        self._titles: list[str] = []
+
+    def __len__(self) -> int:
+        """Return the number of indexed channels."""
+        return len(self._by_id)
+
+    def update(self, channels: list[TvChannel]) -> None:
+        """Bring the index in line with a new channel list."""
+        new_by_id = {channel.id: channel for channel in channels}
+
+        for channel_id in self._by_id.keys() - new_by_id.keys():
+            self._remove(self._by_id[channel_id])
+
+        for channel_id, channel in new_by_id.items():
+            current = self._by_id.get(channel_id)
+            if current == channel:
+                continue
+            if current is not None:
+                self._remove(current)
+            self._add(channel)
+
+    def _add(self, channel: TvChannel) -> None:
+        """Add a channel to the index."""
+        self._by_id[channel.id] = channel
+        self._by_number[str(channel.number)] = channel
+        self._by_group.setdefault(channel.group, {})[channel.id] = channel
+        if channel.favorite:
+            self._favorites[channel.id] = channel
+
+        title = normalize_title(channel.title)
+        if title not in self._by_title:
+            insort(self._titles, title)
+        self._by_title[title] = channel
+
+    def _remove(self, channel: TvChannel) -> None:
+        """Remove a channel from the index."""
+        del self._by_id[channel.id]
+        self._favorites.pop(channel.id, None)
+
+        if self._by_number.get(str(channel.number)) is channel:
+            del self._by_number[str(channel.number)]
+
+        if group := self._by_group.get(channel.group):
+            group.pop(channel.id, None)
+            if not group:
+                del self._by_group[channel.group]
+
+        title = normalize_title(channel.title)
+        if self._by_title.get(title) is channel:
+            del self._by_title[title]
+            index = bisect_left(self._titles, title)
+            if index < len(self._titles) and self._titles[index] == title:
+                del self._titles[index]
+
+    def get_by_id(self, channel_id: str) -> TvChannel | None:
+        """Return the channel with the given id."""
+        return self._by_id.get(channel_id)
+
+    def get_by_number(self, number: str | int) -> TvChannel | None:
+        """Return the channel with the given number."""
+        return self._by_number.get(str(number).strip())
+
+    def get_group(self, group: str) -> list[TvChannel]:
+        """Return the channels of a group."""
+        return list(self._by_group.get(group, {}).values())
+
+    @property
+    def favorites(self) -> list[TvChannel]:
+        """Return the favourite channels."""
+        return list(self._favorites.values())
+
+    @property
+    def groups(self) -> list[str]:
+        """Return all channel groups."""
+        return list(self._by_group)
+
+    def find_by_name(self, name: str) -> TvChannel | None:
+        """Return the channel best matching a name.
+
+        An exact match of the normalized title wins, then the first title
+        starting with the name, then the closest fuzzy match.
+        """
+        if not (title := normalize_title(name)):
+            return None
+
+        if (channel := self._by_title.get(title)) is not None:
+            return channel
+
+        index = bisect_left(self._titles, title)
+        if index < len(self._titles) and self._titles[index].startswith(title):
+            return self._by_title[self._titles[index]]
+
+        if matches := difflib.get_close_matches(title, self._titles, n=1, cutoff=0.6):
+            return self._by_title[matches[0]]
+
+        return None
+
+    def resolve(
+        self,
+        channel_id: str | None = None,
+        number: str | int | None = None,
+        name: str | None = None,
+    ) -> TvChannel | None:
+        """Resolve a channel from an id, a number or a name."""
+        if channel_id:
+            return self.get_by_id(channel_id)
+        if number is not None and number != "":
+            return self.get_by_number(number)
+        if name:
+            return self.find_by_name(name)
+        return None
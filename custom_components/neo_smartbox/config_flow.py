@@ -9,13 +9,14 @@ import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.config_entries import ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_API_KEY
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
-from .models import NeoSmartboxApiClient
+from .const import CONF_HOLD_OFFLINE_COMMANDS, DOMAIN
+from .models import NeoSmartboxApiClient, PartialDeviceListError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +29,12 @@ class NeoSmartboxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow."""
+        return NeoSmartboxOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -73,4 +80,33 @@ class NeoSmartboxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Validate the API key by retrieving devices."""
         session = async_get_clientsession(self.hass)
         api_client = NeoSmartboxApiClient(api_key, session)
-        return await api_client.get_all_devices()
+        try:
+            return await api_client.get_all_devices()
+        except PartialDeviceListError as err:
+            # The key is valid if at least one of the device lists loaded
+            return err.devices
+
+
+class NeoSmartboxOptionsFlow(OptionsFlow):
+    """Handle NEO Smartbox options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_HOLD_OFFLINE_COMMANDS,
+                        default=self.config_entry.options.get(
+                            CONF_HOLD_OFFLINE_COMMANDS, False
+                        ),
+                    ): bool,
+                }
+            ),
+        )
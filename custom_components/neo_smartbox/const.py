@@ -4,6 +4,10 @@ from typing import Final
 
 DOMAIN: Final = "neo_smartbox"
 
+DATA_TARGET_INDEX: Final = f"{DOMAIN}_target_index"
+DATA_LOGO_CACHE: Final = f"{DOMAIN}_logo_cache"
+DATA_TRANSPORT: Final = f"{DOMAIN}_transport"
+
 # API endpoints
 API_BASE_URL: Final = "https://stargate.telekom.si/api"
 API_DEVICE_LIST: Final = f"{API_BASE_URL}/titan.tv.CompanionService/DeviceList"
@@ -18,10 +22,91 @@ API_NAVIGATE_ACTION: Final = f"{API_BASE_URL}/titan.tv.CompanionService/Navigate
 
 # Configuration
 CONF_API_KEY: Final = "api_key"
+CONF_HOLD_OFFLINE_COMMANDS: Final = "hold_offline_commands"
+
+# Persistent cache of the device and channel lists
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY: Final = 10
+
+# Limits of remote command sequences
+MAX_SEQUENCE_STEPS: Final = 50
+MAX_SEQUENCE_DELAY: Final = 60
+
+# Channel logo cache: size limit, revalidation age and browser cache age
+LOGO_CACHE_MAX_BYTES: Final = 20 * 1024 * 1024
+LOGO_REVALIDATE_AFTER: Final = 7 * 24 * 3600
+LOGO_MAX_AGE: Final = 24 * 3600
+LOGO_PREFETCH_CONCURRENCY: Final = 4
+
+# Channels per page in the media browser
+BROWSE_PAGE_SIZE: Final = 50
+
+# Seconds before the channel list is refreshed in the background
+CHANNEL_LIST_TTL: Final = 3600
+
+# Successful polls a device must be missing from before it is removed
+DEVICE_REMOVAL_POLLS: Final = 3
 
 # Data update interval (in seconds)
 UPDATE_INTERVAL: Final = 60  # Cloud polling minimum
 
+# Longest device list poll interval while the list is stable, and how long
+# polling stays at UPDATE_INTERVAL after user activity
+POLL_INTERVAL_MAX: Final = 900
+POLL_BOOST_DURATION: Final = 300
+
+# Poll intervals are stretched by up to this fraction so that several
+# accounts do not poll in lockstep
+POLL_JITTER: Final = 0.1
+
+# Maximum number of concurrent requests when a service targets many devices
+FAN_OUT_LIMIT: Final = 4
+
+# HTTP transport for the NEO cloud API
+TRANSPORT_CONNECTION_LIMIT: Final = 8
+TRANSPORT_DNS_CACHE_TTL: Final = 300
+TRANSPORT_KEEPALIVE_TIMEOUT: Final = 60
+TRANSPORT_WARM_UP_INTERVAL: Final = 45
+# Seconds after the last interactive request that connections are kept warm
+TRANSPORT_WARM_UP_WINDOW: Final = 600
+
+# Maximum number of API requests in flight, shared by all accounts
+MAX_CONCURRENT_REQUESTS: Final = 4
+
+# Client side rate limit (requests per second) and burst size
+RATE_LIMIT_MAX_RATE: Final = 10.0
+RATE_LIMIT_MIN_RATE: Final = 0.5
+RATE_LIMIT_BURST: Final = 10
+
+# Retries of idempotent reads
+API_MAX_RETRIES: Final = 2
+API_RETRY_BASE_DELAY: Final = 0.5
+API_RETRY_MAX_DELAY: Final = 5.0
+
+# Consecutive failures before the API is considered down, and for how long
+BREAKER_FAILURE_THRESHOLD: Final = 5
+BREAKER_OPEN_SECONDS: Final = 30
+
+# Upper bounds (in milliseconds) of the request latency histogram buckets
+LATENCY_BUCKETS_MS: Final = (25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Every n-th request per endpoint is traced at debug level
+TRACE_SAMPLE_EVERY: Final = 10
+
+# Number of recent requests kept per priority class for latency statistics
+LATENCY_SAMPLES: Final = 200
+
+# Repeated key presses queued within this window (in seconds) are merged
+COALESCE_WINDOW: Final = 0.5
+
+# Device health: failures in a row before a device is offline, seconds
+# between probes of an offline device, the window of the health score and
+# how long a held command may wait for the next probe
+HEALTH_OFFLINE_FAILURES: Final = 3
+HEALTH_PROBE_INTERVAL: Final = 60
+HEALTH_WINDOW: Final = 20
+HEALTH_HOLD_TIMEOUT: Final = 60
+
 # Remote commands for NEO Smartbox
 REMOTE_COMMANDS = {
     "power": "Power",
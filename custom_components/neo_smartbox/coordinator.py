@@ -1,57 +1,533 @@
 """Data update coordinator for NEO Smartbox."""
 
+import asyncio
+from dataclasses import dataclass, field
 from datetime import timedelta
 import logging
+import random
+import time
 
 import aiohttp
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, UPDATE_INTERVAL
-from .models import NeoSmartboxApiClient, NeoSmartboxDevice
+from .cache import NeoSmartboxCache
+from .channels import ChannelIndex
+from .const import (
+    CHANNEL_LIST_TTL,
+    CONF_HOLD_OFFLINE_COMMANDS,
+    DATA_LOGO_CACHE,
+    DATA_TARGET_INDEX,
+    DATA_TRANSPORT,
+    DEVICE_REMOVAL_POLLS,
+    DOMAIN,
+    POLL_BOOST_DURATION,
+    POLL_INTERVAL_MAX,
+    POLL_JITTER,
+    UPDATE_INTERVAL,
+)
+from .dispatcher import DeviceCommandQueue
+from .health import DeviceHealth, DeviceOfflineError, signal_health_updated
+from .models import (
+    NeoDeviceType,
+    NeoSmartboxApiClient,
+    NeoSmartboxDevice,
+    PartialDeviceListError,
+    TvChannel,
+)
+from .scheduler import RequestPriority
+from .sequence import SequenceStep
+from .transport import NeoSmartboxTransport
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class DeviceDiff:
+    """Devices that changed with the last update, keyed by device id."""
+
+    added: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    changed: set[str] = field(default_factory=set)
+
+
 class NeoSmartboxUpdateCoordinator(DataUpdateCoordinator[list[NeoSmartboxDevice]]):
     """Class to manage fetching NEO Smartbox data."""
 
-    def __init__(self, hass: HomeAssistant, api_key: str) -> None:
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize data update coordinator."""
         self.hass = hass
-        self.api_key = api_key
+        self.api_key = config_entry.data[CONF_API_KEY]
+        self.transport: NeoSmartboxTransport = hass.data[DATA_TRANSPORT]
         self.api_client = self._create_api_client()
+        self.cache = NeoSmartboxCache(hass, config_entry.entry_id)
+        self.channels: list[TvChannel] = []
+        self.channel_index = ChannelIndex()
+        self.channel_ttl = CHANNEL_LIST_TTL
+        self._channels_fetched: float | None = None
+        self._channel_fetch: asyncio.Task[list[TvChannel]] | None = None
+        self.stale_device_types: set[NeoDeviceType] = set()
+        self.command_queues: dict[str, DeviceCommandQueue] = {}
+        self.sequences: dict[str, asyncio.Task[bool]] = {}
+        self.devices: dict[str, NeoSmartboxDevice] = {}
+        self.health: dict[str, DeviceHealth] = {}
+        self.missing_devices: dict[str, int] = {}
+        self.device_diff = DeviceDiff()
+        self.suppressed_writes = 0
+        self._boost_until = time.monotonic() + POLL_BOOST_DURATION
+        self._poll_interval = UPDATE_INTERVAL
+        self._last_fetched: list[NeoSmartboxDevice] | None = None
 
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=DOMAIN,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            update_interval=self._jittered(UPDATE_INTERVAL),
+            # Listeners are only notified when the device list changed
+            always_update=False,
         )
 
+    async def async_load_cache(self) -> bool:
+        """Load the cached device and channel lists.
+
+        Returns True if cached devices were found and published.
+        """
+        await self.cache.async_load()
+        self.channels = self.cache.channels
+        self.channel_index.update(self.channels)
+
+        if not (devices := self.cache.devices):
+            return False
+
+        self.async_set_updated_data(devices)
+        return True
+
+    async def async_get_channels(self) -> list[TvChannel]:
+        """Return the channel list.
+
+        Known channels are returned right away. If they are older than the
+        TTL, a refresh is started in the background.
+        """
+        if not self.channels:
+            return await self.async_refresh_channels()
+
+        if (self._channel_fetch is None or self._channel_fetch.done()) and (
+            self._channels_fetched is None
+            or time.monotonic() - self._channels_fetched > self.channel_ttl
+        ):
+            self._async_start_channel_fetch().add_done_callback(
+                self._async_channel_fetch_done
+            )
+
+        return self.channels
+
+    async def async_resolve_channel(
+        self,
+        channel_id: str | None = None,
+        number: str | int | None = None,
+        name: str | None = None,
+    ) -> TvChannel | None:
+        """Resolve a channel from an id, a number or a name."""
+        await self.async_get_channels()
+        return self.channel_index.resolve(channel_id, number, name)
+
+    async def async_refresh_channels(self) -> list[TvChannel]:
+        """Fetch the channel list, sharing a fetch that is already running."""
+        return await asyncio.shield(self._async_start_channel_fetch())
+
+    def _async_start_channel_fetch(self) -> asyncio.Task[list[TvChannel]]:
+        """Start a channel list fetch unless one is in flight."""
+        if self._channel_fetch is None or self._channel_fetch.done():
+            self._channel_fetch = self.hass.async_create_background_task(
+                self._async_fetch_channels(), "neo_smartbox channel list"
+            )
+        return self._channel_fetch
+
+    async def _async_fetch_channels(self) -> list[TvChannel]:
+        """Fetch the channel list and update the cache."""
+        channels = await self.api_client.get_channel_list()
+        self._channels_fetched = time.monotonic()
+
+        if channels != self.channels:
+            self.channels = channels
+            self.channel_index.update(channels)
+            self.cache.async_set_channels(channels)
+
+            if logo_cache := self.hass.data.get(DATA_LOGO_CACHE):
+                logo_cache.async_prefetch(channels)
+
+        return channels
+
+    @staticmethod
+    def _async_channel_fetch_done(task: asyncio.Task[list[TvChannel]]) -> None:
+        """Log errors of background channel list refreshes."""
+        if not task.cancelled() and (err := task.exception()):
+            _LOGGER.warning("Error refreshing channel list: %s", err)
+
     def _create_api_client(self) -> NeoSmartboxApiClient:
         """Create a new API client instance."""
         return NeoSmartboxApiClient(
             api_key=self.api_key,
-            session=async_get_clientsession(self.hass),
+            session=lambda: self.transport.session,
+            scheduler=self.transport.scheduler,
+            rate_limiter=self.transport.rate_limiter,
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Compute the device diff before notifying the listeners."""
+        devices = {device.id: device for device in self.data or []}
+
+        self.device_diff = DeviceDiff(
+            added=devices.keys() - self.devices.keys(),
+            removed=self.devices.keys() - devices.keys(),
+            changed={
+                device_id
+                for device_id, device in devices.items()
+                if device_id in self.devices and self.devices[device_id] != device
+            },
+        )
+        self.devices = devices
+        self.hass.data[DATA_TARGET_INDEX].async_route_devices(
+            self, self.device_diff.added, self.device_diff.removed
+        )
+
+        for device_id in self.device_diff.added:
+            self.health[device_id] = DeviceHealth(self.hass, device_id)
+
+        for device_id in self.device_diff.removed:
+            self.health.pop(device_id, None)
+            if queue := self.command_queues.pop(device_id, None):
+                queue.async_shutdown()
+
+        super().async_update_listeners()
+
+    def get_command_queue(self, device_id: str) -> DeviceCommandQueue:
+        """Return the command queue of a device, creating it if needed."""
+        if (queue := self.command_queues.get(device_id)) is None:
+
+            async def _async_send_key(
+                key_name: str,
+                long_press: bool,
+                key_repeat: int,
+                priority: RequestPriority,
+            ) -> bool:
+                success = await self.api_client.send_key_action(
+                    device_id=device_id,
+                    key_name=key_name,
+                    long_press=long_press,
+                    key_repeat=key_repeat,
+                    priority=priority,
+                )
+                self._async_record_outcome(device_id, success)
+                return success
+
+            queue = self.command_queues[device_id] = DeviceCommandQueue(
+                self.hass, device_id, _async_send_key
+            )
+        return queue
+
+    def is_available(self, device_id: str) -> bool:
+        """Return if a device is listed and not known to be offline."""
+        return (
+            device_id not in self.missing_devices
+            and (health := self.health.get(device_id)) is not None
+            and health.available
+        )
+
+    async def _async_check_device(self, device_id: str) -> None:
+        """Fail fast, or hold the command, if a device is offline."""
+        if (
+            health := self.health.get(device_id)
+        ) is None or device_id in self.missing_devices:
+            raise DeviceOfflineError(f"Device {device_id} is not in the device list")
+
+        await health.async_check(
+            self.config_entry.options.get(CONF_HOLD_OFFLINE_COMMANDS, False)
+        )
+
+    @callback
+    def _async_record_outcome(self, device_id: str, success: bool) -> None:
+        """Update the health of a device with a command outcome.
+
+        Only results returned by the API client count. Errors it raises,
+        such as throttling or an open circuit breaker, are not the device's
+        fault and are never recorded.
+        """
+        if health := self.health.get(device_id):
+            health.async_record(success)
+
+    async def async_send_key(
+        self,
+        device_id: str,
+        key_name: str,
+        long_press: bool = False,
+        key_repeat: int = 0,
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> bool:
+        """Send a key press through the device's command queue."""
+        self.async_note_activity()
+        await self._async_check_device(device_id)
+        return await self.get_command_queue(device_id).async_send_key(
+            key_name, long_press, key_repeat, priority
+        )
+
+    async def async_navigate(
+        self,
+        device_id: str,
+        action: str,
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> bool:
+        """Navigate a device to an app path."""
+        self.async_note_activity()
+        await self._async_check_device(device_id)
+        success = await self.api_client.navigate_action(device_id, action, priority)
+        self._async_record_outcome(device_id, success)
+        return success
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll at the shortest interval for a while after user activity.
+
+        If polling had backed off, the device list is refreshed in the
+        background so that the shorter interval takes effect.
+        """
+        self._boost_until = time.monotonic() + POLL_BOOST_DURATION
+
+        if self._poll_interval != UPDATE_INTERVAL:
+            self._poll_interval = UPDATE_INTERVAL
+            self.update_interval = self._jittered(UPDATE_INTERVAL)
+            self.hass.async_create_background_task(
+                self.async_request_refresh(), "neo_smartbox activity refresh"
+            )
+
+    def _adapt_update_interval(self, stable: bool) -> None:
+        """Back off while the device list is stable, tighten otherwise."""
+        polling = self.api_client.polling
+        polling.polls += 1
+        polling.polls_avoided += self._poll_interval // UPDATE_INTERVAL - 1
+
+        if stable and time.monotonic() >= self._boost_until:
+            self._poll_interval = min(self._poll_interval * 2, POLL_INTERVAL_MAX)
+        else:
+            self._poll_interval = UPDATE_INTERVAL
+
+        self.update_interval = self._jittered(self._poll_interval)
+
+    @staticmethod
+    def _jittered(seconds: int) -> timedelta:
+        """Stretch an interval randomly to keep accounts from polling together."""
+        return timedelta(seconds=seconds * random.uniform(1, 1 + POLL_JITTER))
+
+    async def async_run_sequence(
+        self,
+        device_id: str,
+        steps: list[SequenceStep],
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> bool:
+        """Run a command sequence, replacing the one running on the device.
+
+        Returns False if a step failed or the sequence was replaced or
+        stopped before it finished.
+        """
+        self.async_stop_sequence(device_id)
+
+        task = self.sequences[device_id] = self.hass.async_create_background_task(
+            self._async_execute_sequence(device_id, steps, priority),
+            f"neo_smartbox sequence {device_id}",
         )
 
+        try:
+            return await task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if task.cancelled() and current is not None and not current.cancelling():
+                return False
+            raise
+        finally:
+            if self.sequences.get(device_id) is task:
+                del self.sequences[device_id]
+
+    @callback
+    def async_stop_sequence(self, device_id: str) -> bool:
+        """Stop the sequence running on a device."""
+        if (task := self.sequences.pop(device_id, None)) and not task.done():
+            task.cancel()
+            return True
+        return False
+
+    async def _async_execute_sequence(
+        self,
+        device_id: str,
+        steps: list[SequenceStep],
+        priority: RequestPriority,
+    ) -> bool:
+        """Send the steps of a sequence in order.
+
+        Runs of key presses are queued on the device queue at once, so each
+        request is ready to go as soon as the previous one completes.
+        """
+        pending: list[asyncio.Task[bool]] = []
+
+        async def _async_press(step: SequenceStep) -> bool:
+            success = False
+            try:
+                success = await self.async_send_key(
+                    device_id,
+                    step.key_name,
+                    step.long_press,
+                    step.key_repeat,
+                    priority,
+                )
+            finally:
+                if not success:
+                    # Drop the presses queued after this one before the
+                    # device queue gets to them
+                    current = asyncio.current_task()
+                    for task in pending:
+                        if task is not current:
+                            task.cancel()
+            return success
+
+        async def _async_flush() -> bool:
+            try:
+                for task in pending:
+                    if not await task:
+                        return False
+                return True
+            finally:
+                for task in pending:
+                    task.cancel()
+                pending.clear()
+
+        for step in steps:
+            if step.key_name is not None:
+                pending.append(asyncio.ensure_future(_async_press(step)))
+                continue
+
+            if not await _async_flush():
+                return False
+
+            if step.navigate_path is not None:
+                if not await self.async_navigate(
+                    device_id, step.navigate_path, priority
+                ):
+                    return False
+            elif step.delay:
+                await asyncio.sleep(step.delay)
+
+        return await _async_flush()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending commands and shut down the coordinator."""
+        for task in self.sequences.values():
+            task.cancel()
+        self.sequences.clear()
+        for queue in self.command_queues.values():
+            queue.async_shutdown()
+        self.command_queues.clear()
+        self.hass.data[DATA_TARGET_INDEX].async_route_devices(self, (), self.devices)
+        await super().async_shutdown()
+
+    def _async_cache_devices(self, devices: list[NeoSmartboxDevice]) -> None:
+        """Save the device list if it changed."""
+        if devices != self.data:
+            self.cache.async_set_devices(devices)
+
+    def _keep_missing_devices(
+        self, devices: list[NeoSmartboxDevice], partial: bool = False
+    ) -> list[NeoSmartboxDevice]:
+        """Keep devices missing from a device list for a few polls.
+
+        A device is only removed after it was missing from
+        DEVICE_REMOVAL_POLLS full lists in a row. Until then it is kept, but
+        unavailable, so a box that is briefly unplugged or dropped by the
+        cloud keeps its registry entry. A partial list keeps every device
+        it does not contain without counting a miss.
+        """
+        if not self.missing_devices and devices is self.data:
+            return devices
+
+        listed = {device.id for device in devices}
+        kept: list[NeoSmartboxDevice] = []
+
+        for device_id in [*self.missing_devices]:
+            if device_id in listed:
+                del self.missing_devices[device_id]
+                async_dispatcher_send(self.hass, signal_health_updated(device_id))
+
+        for device_id, device in self.devices.items():
+            if device_id in listed:
+                continue
+
+            if partial:
+                kept.append(device)
+                continue
+
+            misses = self.missing_devices.get(device_id, 0) + 1
+            if misses >= DEVICE_REMOVAL_POLLS:
+                self.missing_devices.pop(device_id, None)
+                continue
+
+            self.missing_devices[device_id] = misses
+            kept.append(device)
+
+            if misses == 1:
+                _LOGGER.info("Device %s is missing from the device list", device_id)
+                async_dispatcher_send(self.hass, signal_health_updated(device_id))
+
+        return devices + kept if kept else devices
+
+    def _merge_partial_update(
+        self, err: PartialDeviceListError
+    ) -> list[NeoSmartboxDevice]:
+        """Keep the last known devices that the partial list does not contain.
+
+        Besides the devices of the types that failed to update, this keeps
+        devices missing from the list that did update. They are neither
+        counted as missed nor removed until a full list confirms it.
+        """
+        _LOGGER.warning("Partial device list update: %s", err)
+        self.stale_device_types = set(err.failed)
+
+        return self._keep_missing_devices(err.devices, partial=True)
+
     async def _async_update_data(self) -> list[NeoSmartboxDevice]:
-        """Fetch data from API endpoint."""
+        """Fetch data from API endpoint.
+
+        When the API returned the same payloads as last time, the current
+        list is returned as is and the listeners are not notified.
+        """
         try:
-            return await self.api_client.get_all_devices()
+            devices = await self.api_client.get_all_devices()
+        except PartialDeviceListError as err:
+            self._adapt_update_interval(stable=False)
+            return self._merge_partial_update(err)
         except aiohttp.ClientConnectionError as err:
+            self._adapt_update_interval(stable=False)
             _LOGGER.error("Connection error: %s", err)
             raise UpdateFailed(f"Connection error: {err}") from err
         except aiohttp.ClientError as err:
-            if "Session is closed" in str(err):
-                _LOGGER.warning("Session closed, recreating API client")
-                self.api_client = self._create_api_client()
-                return await self.api_client.get_all_devices()
+            self._adapt_update_interval(stable=False)
             _LOGGER.error("Error communicating with API: %s", err)
             raise UpdateFailed(f"Error communicating with API: {err}") from err
         except Exception as err:
+            self._adapt_update_interval(stable=False)
             _LOGGER.error("Error fetching neo_smartbox data: %s", err)
             raise UpdateFailed(f"Error fetching neo_smartbox data: {err}") from err
+
+        self._adapt_update_interval(stable=devices is self._last_fetched)
+        self._last_fetched = devices
+        devices = self._keep_missing_devices(devices)
+
+        if not self.stale_device_types and devices is self.data:
+            return devices
+
+        self.stale_device_types = set()
+        self._async_cache_devices(devices)
+        return devices
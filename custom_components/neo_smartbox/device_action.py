@@ -11,11 +11,16 @@ import voluptuous as vol
 from homeassistant.components.device_automation import async_validate_entity_schema
 from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_TYPE
 from homeassistant.core import Context, HomeAssistant
-from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    selector,
+)
 from homeassistant.helpers.typing import ConfigType, TemplateVarsType
 
-from . import DOMAIN, NAVIGATE_TO_CUSTOM_ACTION, REMOTE_KEY_ACTION
+from . import DOMAIN, NAVIGATE_TO_CUSTOM_ACTION, REMOTE_KEY_ACTION, RUN_SEQUENCE
 from .const import NEO_APP_COMMANDS
+from .sequence import ATTR_SEQUENCE, SEQUENCE_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,12 +32,15 @@ NAVIGATE_TO_LIVE_CHANNEL = "navigate_to_live_channel"
 
 ATTR_DESTINATION = "destination"
 ATTR_CHANNEL_ID = "channel_id"
+ATTR_CHANNEL_NUMBER = "channel_number"
+ATTR_CHANNEL_NAME = "channel_name"
 ATTR_LONG_PRESS = "long_press"
 
 
 ACTION_TYPES = list(NEO_APP_COMMANDS.keys())
 ACTION_TYPES.append(NAVIGATE_TO)
 ACTION_TYPES.append(NAVIGATE_TO_LIVE_CHANNEL)
+ACTION_TYPES.append(RUN_SEQUENCE)
 
 
 ACTION_SCHEMA = cv.DEVICE_ACTION_BASE_SCHEMA.extend(
@@ -41,6 +49,9 @@ ACTION_SCHEMA = cv.DEVICE_ACTION_BASE_SCHEMA.extend(
         vol.Optional(ATTR_LONG_PRESS, default=False): cv.boolean,
         vol.Optional(ATTR_DESTINATION): cv.string,
         vol.Optional(ATTR_CHANNEL_ID): cv.string,
+        vol.Optional(ATTR_CHANNEL_NUMBER): cv.string,
+        vol.Optional(ATTR_CHANNEL_NAME): cv.string,
+        vol.Optional(ATTR_SEQUENCE): SEQUENCE_SCHEMA,
     }
 )
 
@@ -59,6 +70,10 @@ async def async_get_actions(
     registry = dr.async_get(hass)
     device = registry.async_get(device_id)
 
+    if device and device.entry_type is dr.DeviceEntryType.SERVICE:
+        # The account's diagnostic device has no remote
+        return []
+
     # A list of actions that can be performed on the device
     actions: list[dict[str, Any]] = [
         {
@@ -71,6 +86,11 @@ async def async_get_actions(
             CONF_DOMAIN: DOMAIN,
             CONF_TYPE: NAVIGATE_TO_LIVE_CHANNEL,
         },
+        {
+            CONF_DEVICE_ID: device_id,
+            CONF_DOMAIN: DOMAIN,
+            CONF_TYPE: RUN_SEQUENCE,
+        },
     ]
 
     # Check if device belongs to this integration
@@ -106,6 +126,15 @@ async def async_get_action_capabilities(
             )
         }
 
+    if config[CONF_TYPE] == RUN_SEQUENCE:
+        return {
+            "extra_fields": vol.Schema(
+                {
+                    vol.Required(ATTR_SEQUENCE): selector.ObjectSelector(),
+                }
+            )
+        }
+
     if config[CONF_TYPE] == NAVIGATE_TO_LIVE_CHANNEL:
         # Get the list of channels from the coordinator
 
@@ -133,7 +162,7 @@ async def async_get_action_capabilities(
                 f"Coordinator not found for device {config[CONF_DEVICE_ID]}"
             )
 
-        tv_channels = await coordinator.api_client.get_channel_list()
+        tv_channels = await coordinator.async_get_channels()
 
         channel_options = {
             channel.id: f"{channel.number} - {channel.title}" for channel in tv_channels
@@ -142,7 +171,9 @@ async def async_get_action_capabilities(
         return {
             "extra_fields": vol.Schema(
                 {
-                    vol.Required(ATTR_CHANNEL_ID): vol.In(channel_options),
+                    vol.Optional(ATTR_CHANNEL_ID): vol.In(channel_options),
+                    vol.Optional(ATTR_CHANNEL_NUMBER): cv.string,
+                    vol.Optional(ATTR_CHANNEL_NAME): cv.string,
                 }
             )
         }
@@ -164,6 +195,20 @@ async def async_call_action_from_config(
 ) -> None:
     """Execute a device action."""
 
+    if config[CONF_TYPE] == RUN_SEQUENCE:
+        await hass.services.async_call(
+            DOMAIN,
+            RUN_SEQUENCE,
+            {
+                "device_id": [config[CONF_DEVICE_ID]],
+                ATTR_SEQUENCE: config.get(ATTR_SEQUENCE, []),
+            },
+            blocking=True,
+            context=context,
+        )
+
+        return
+
     if (
         config[CONF_TYPE] != NAVIGATE_TO
         and config[CONF_TYPE] != NAVIGATE_TO_LIVE_CHANNEL
@@ -195,7 +240,28 @@ async def async_call_action_from_config(
     elif config[CONF_TYPE] == NAVIGATE_TO_LIVE_CHANNEL:
         channel_id = config.get(ATTR_CHANNEL_ID)
         if not channel_id:
-            _LOGGER.error("Channel ID is required for navigate_to_live_channel")
+            channel_number = config.get(ATTR_CHANNEL_NUMBER)
+            channel_name = config.get(ATTR_CHANNEL_NAME)
+
+            if not channel_number and not channel_name:
+                _LOGGER.error(
+                    "Channel ID, number or name is required for "
+                    "navigate_to_live_channel"
+                )
+                return
+
+            # Let the service resolve the channel from its number or name
+            await hass.services.async_call(
+                DOMAIN,
+                NAVIGATE_TO_LIVE_CHANNEL,
+                {
+                    "device_id": [config[CONF_DEVICE_ID]],
+                    ATTR_CHANNEL_NUMBER: channel_number,
+                    ATTR_CHANNEL_NAME: channel_name,
+                },
+                blocking=True,
+                context=context,
+            )
             return
 
         navigate_to_path = f"app://player/livetv/id/{channel_id}"
@@ -0,0 +1,45 @@
+"""Diagnostics support for NEO Smartbox."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_LOGO_CACHE
+from .coordinator import NeoSmartboxUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: NeoSmartboxUpdateCoordinator = entry.runtime_data
+
+    return {
+        "device_count": len(coordinator.data or []),
+        "suppressed_writes": coordinator.suppressed_writes,
+        "missing_devices": coordinator.missing_devices,
+        "stale_device_types": [
+            device_type.value for device_type in coordinator.stale_device_types
+        ],
+        "update_interval": coordinator.update_interval.total_seconds()
+        if coordinator.update_interval
+        else None,
+        "polling": coordinator.api_client.polling.diagnostics(),
+        "endpoints": coordinator.api_client.metrics.diagnostics(),
+        "transport": coordinator.transport.diagnostics(),
+        "scheduler": coordinator.api_client.scheduler.diagnostics(),
+        "rate_limiter": coordinator.api_client.rate_limiter.diagnostics(),
+        "circuit_breaker": coordinator.api_client.circuit_breaker.diagnostics(),
+        "device_health": {
+            device_id: health.diagnostics()
+            for device_id, health in coordinator.health.items()
+        },
+        "command_queues": {
+            device_id: queue.diagnostics()
+            for device_id, queue in coordinator.command_queues.items()
+        },
+        "logo_cache": hass.data[DATA_LOGO_CACHE].diagnostics(),
+    }
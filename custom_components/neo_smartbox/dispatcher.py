@@ -0,0 +1,211 @@
+"""Command dispatching for NEO Smartbox devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import COALESCE_WINDOW, FAN_OUT_LIMIT
+from .scheduler import RequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_fan_out(
+    box_device_ids: Iterable[str | None],
+    send: Callable[[str], Awaitable[bool]],
+    limit: int = FAN_OUT_LIMIT,
+) -> dict[str, dict[str, Any]]:
+    """Send a command to several devices at once.
+
+    At most `limit` requests are in flight at the same time. Each device
+    gets its own result, so a failing device does not hide the others.
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def _send(box_device_id: str) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                success = await send(box_device_id)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.error("Error sending command to %s: %s", box_device_id, err)
+                return {"success": False, "error": str(err) or type(err).__name__}
+
+        if not success:
+            return {"success": False, "error": "request_failed"}
+
+        return {"success": True, "error": None}
+
+    targets = []
+    for box_device_id in box_device_ids:
+        if not box_device_id:
+            _LOGGER.error("Device not found in device registry")
+            continue
+        if box_device_id not in targets:
+            targets.append(box_device_id)
+
+    results = await asyncio.gather(*(_send(target) for target in targets))
+
+    return dict(zip(targets, results, strict=True))
+
+
+@dataclass
+class QueuedKeyCommand:
+    """A key press waiting to be sent to a device.
+
+    Every caller merged into the command has a future and the number of
+    presses it asked for, in the same order.
+    """
+
+    key_name: str
+    long_press: bool
+    priority: RequestPriority
+    enqueued: float
+    futures: list[asyncio.Future[bool]] = field(default_factory=list)
+    presses: list[int] = field(default_factory=list)
+
+    @property
+    def key_repeat(self) -> int:
+        """Return the repeat count of the presses somebody still waits for."""
+        return (
+            sum(
+                presses
+                for future, presses in zip(self.futures, self.presses, strict=True)
+                if not future.cancelled()
+            )
+            - 1
+        )
+
+
+class DeviceCommandQueue:
+    """Ordered command queue for a single device.
+
+    Key presses are sent one at a time in the order they were queued.
+    While a press is in flight, repeated presses of the same key that
+    arrive within the coalesce window are merged into one request using
+    the key_repeat field. Presses of callers that were cancelled before
+    the request is sent are left out of it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device_id: str,
+        send_key: Callable[[str, bool, int, RequestPriority], Awaitable[bool]],
+        coalesce_window: float = COALESCE_WINDOW,
+    ) -> None:
+        """Initialize the command queue."""
+        self.hass = hass
+        self.device_id = device_id
+        self._send_key = send_key
+        self._coalesce_window = coalesce_window
+        self._pending: deque[QueuedKeyCommand] = deque()
+        self._worker: asyncio.Task[None] | None = None
+        self.sent_count = 0
+        self.coalesced_count = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of requests waiting to be sent."""
+        return len(self._pending)
+
+    async def async_send_key(
+        self,
+        key_name: str,
+        long_press: bool = False,
+        key_repeat: int = 0,
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> bool:
+        """Queue a key press and wait until it has been sent."""
+        future: asyncio.Future[bool] = self.hass.loop.create_future()
+        now = time.monotonic()
+
+        tail = self._pending[-1] if self._pending else None
+
+        if (
+            tail is not None
+            and not long_press
+            and not tail.long_press
+            and tail.key_name == key_name
+            and tail.priority == priority
+            and now - tail.enqueued <= self._coalesce_window
+        ):
+            tail.futures.append(future)
+            tail.presses.append(key_repeat + 1)
+            self.coalesced_count += 1
+        else:
+            self._pending.append(
+                QueuedKeyCommand(
+                    key_name, long_press, priority, now, [future], [key_repeat + 1]
+                )
+            )
+            self.max_depth = max(self.max_depth, len(self._pending))
+
+        if self._worker is None or self._worker.done():
+            self._worker = self.hass.async_create_background_task(
+                self._async_process(), f"neo_smartbox command queue {self.device_id}"
+            )
+
+        return await future
+
+    async def _async_process(self) -> None:
+        """Send queued commands until the queue is empty."""
+        while self._pending:
+            command = self._pending.popleft()
+
+            if all(future.cancelled() for future in command.futures):
+                # Nobody is waiting for this command any more
+                continue
+
+            try:
+                result = await self._send_key(
+                    command.key_name,
+                    command.long_press,
+                    command.key_repeat,
+                    command.priority,
+                )
+            except asyncio.CancelledError:
+                for future in command.futures:
+                    future.cancel()
+                raise
+            except Exception as err:  # noqa: BLE001
+                for future in command.futures:
+                    if not future.done():
+                        future.set_exception(err)
+            else:
+                for future in command.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+            self.sent_count += 1
+
+            # Let waiters react to the result before the next command is
+            # sent, so a failed sequence can still drop its later presses
+            await asyncio.sleep(0)
+
+    def async_shutdown(self) -> None:
+        """Stop the worker and cancel all waiting commands."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        while self._pending:
+            for future in self._pending.popleft().futures:
+                future.cancel()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return queue statistics."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "sent": self.sent_count,
+            "coalesced": self.coalesced_count,
+        }
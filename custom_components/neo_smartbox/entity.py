@@ -0,0 +1,22 @@
+"""Shared entity helpers for NEO Smartbox."""
+
+from __future__ import annotations
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+from .models import NeoDeviceType, NeoSmartboxDevice
+
+
+def get_device_info(device: NeoSmartboxDevice) -> DeviceInfo:
+    """Return the device registry entry of a NEO device.
+
+    Every platform registers the device with the full entry, as the first
+    one to be set up creates it.
+    """
+    return DeviceInfo(
+        identifiers={(DOMAIN, device.id)},
+        name=device.name,
+        manufacturer="Telekom Slovenia",
+        model="NEO Smartbox" if device.type == NeoDeviceType.STB else "NEO TV Lite",
+    )
@@ -1,10 +1,28 @@
 """Frontend for NEO Smartbox integration."""
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gzip
+import hashlib
+from http import HTTPStatus
 import logging
 from pathlib import Path
+from typing import Any
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView, StaticPathConfig
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
+
+from ..const import STORAGE_VERSION
 
-from homeassistant.components.http import StaticPathConfig
-from homeassistant.core import HomeAssistant
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -12,26 +30,138 @@ LOVELACE_DOMAIN = "lovelace"
 
 DOMAIN = "neo_smartbox"
 
+CARD_PATH = Path(__file__).parent / "card" / "neo-smartbox-remote-card.js"
+
+# Unversioned URL, kept for dashboards that reference it in YAML
+RESOURCE_URL = "/static/neo_smartbox-card.js"
+
+CARD_URL_PREFIX = f"/api/{DOMAIN}/card/"
+CARD_URL = f"{CARD_URL_PREFIX}{{digest}}.js"
+
+STORAGE_KEY = f"{DOMAIN}.frontend"
+
+
+@dataclass(frozen=True, slots=True)
+class CardAsset:
+    """The card script with its content digest and compressed variants."""
+
+    digest: str
+    body: bytes
+    gzip: bytes
+    brotli: bytes | None
+
+    @property
+    def url(self) -> str:
+        """Return the content addressed URL of the card."""
+        return CARD_URL.format(digest=self.digest)
+
+
+def _load_card(path: Path) -> CardAsset:
+    """Read the card and compress it once."""
+    body = path.read_bytes()
+    return CardAsset(
+        digest=hashlib.sha256(body).hexdigest()[:16],
+        body=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        brotli=brotli.compress(body) if brotli is not None else None,
+    )
+
+
+class CardView(HomeAssistantView):
+    """Serve the card from a URL that changes with its content.
+
+    A request for the current digest may be cached forever. Any other
+    digest still gets the current card, but without long-lived caching.
+    """
+
+    url = CARD_URL
+    name = f"api:{DOMAIN}:card"
+    requires_auth = False
+
+    def __init__(self, card: CardAsset) -> None:
+        """Initialize the view."""
+        self._card = card
+
+    async def get(self, request: web.Request, digest: str) -> web.Response:
+        """Return the card, compressed if the client accepts it."""
+        headers = {
+            hdrs.CACHE_CONTROL: "public, max-age=31536000, immutable"
+            if digest == self._card.digest
+            else "no-cache",
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+        accept_encoding = request.headers.get(hdrs.ACCEPT_ENCODING, "")
+
+        if self._card.brotli is not None and "br" in accept_encoding:
+            body = self._card.brotli
+            headers[hdrs.CONTENT_ENCODING] = "br"
+        elif "gzip" in accept_encoding:
+            body = self._card.gzip
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+        else:
+            body = self._card.body
+
+        return web.Response(
+            body=body,
+            status=HTTPStatus.OK,
+            content_type="application/javascript",
+            headers=headers,
+        )
+
 
 async def async_setup(hass: HomeAssistant) -> bool:
-    """Set up the NEO Smartbox frontend."""
-    # Register the static path for our card
-    frontend_path = Path(__file__).parent
-    card_path = frontend_path / "card"
+    """Set up the NEO Smartbox frontend.
+
+    Only the card's URLs are registered here. The Lovelace resource is
+    registered in the background once Home Assistant has started.
+    """
+    card = await hass.async_add_executor_job(_load_card, CARD_PATH)
+    hass.http.register_view(CardView(card))
 
     # Register static files with the async method
     await hass.http.async_register_static_paths(
         [
             StaticPathConfig(
-                url_path="/static/neo_smartbox-card.js",
-                path=str(card_path / "neo-smartbox-remote-card.js"),
+                url_path=RESOURCE_URL,
+                path=str(CARD_PATH),
                 cache_headers=False,
             )
         ]
     )
 
-    # Register the dashboard resource if Lovelace is in storage mode
-    resource_url = "/static/neo_smartbox-card.js"
+    @callback
+    def _async_started(hass: HomeAssistant) -> None:
+        """Register the dashboard resource without holding up startup."""
+        hass.async_create_background_task(
+            _async_register_resource(hass, card.url), "neo_smartbox lovelace resource"
+        )
+
+    async_at_started(hass, _async_started)
+
+    # We still log instructions for YAML mode users
+    _LOGGER.info(
+        "NEO Smartbox remote card registered at: %s\n"
+        "If using YAML mode, add this to your lovelace resources:\n"
+        "  - url: %s\n"
+        "    type: module",
+        RESOURCE_URL,
+        RESOURCE_URL,
+    )
+
+    return True
+
+
+async def _async_register_resource(hass: HomeAssistant, card_url: str) -> None:
+    """Point the Lovelace resource at the current card if in storage mode.
+
+    An existing card resource, including one with the unversioned URL, is
+    updated in place. The registered URL is remembered, so later boots
+    skip the resource store until the card changes.
+    """
+    store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    if (await store.async_load() or {}).get("resource_url") == card_url:
+        return
 
     if LOVELACE_DOMAIN in hass.data and hasattr(
         hass.data[LOVELACE_DOMAIN], "resources"
@@ -40,21 +170,28 @@ async def async_setup(hass: HomeAssistant) -> bool:
         if hasattr(resources, "async_create_item"):
             # Only attempt to register if we're in storage mode
             try:
-                # Check if resource already exists to avoid duplicates
                 if not resources.loaded:
                     await resources.async_load()
                     resources.loaded = True
 
-                existing_items = resources.async_items()
-                resource_exists = any(
-                    item["url"] == resource_url for item in existing_items
-                )
+                card_items = [
+                    item
+                    for item in resources.async_items()
+                    if item["url"] == RESOURCE_URL
+                    or item["url"].startswith(CARD_URL_PREFIX)
+                ]
+
+                for item in card_items:
+                    if item["url"] != card_url:
+                        await resources.async_update_item(
+                            item["id"], {"res_type": "module", "url": card_url}
+                        )
 
-                if not resource_exists:
+                if not card_items:
                     await resources.async_create_item(
                         {
                             "res_type": "module",
-                            "url": resource_url,
+                            "url": card_url,
                         }
                     )
                     _LOGGER.info(
@@ -62,15 +199,6 @@ async def async_setup(hass: HomeAssistant) -> bool:
                     )
             except (ValueError, RuntimeError) as ex:
                 _LOGGER.warning("Unable to register card automatically: %s", ex)
+                return
 
-    # We still log instructions for YAML mode users
-    _LOGGER.info(
-        "NEO Smartbox remote card registered at: %s\n"
-        "If using YAML mode, add this to your lovelace resources:\n"
-        "  - url: %s\n"
-        "    type: module",
-        resource_url,
-        resource_url,
-    )
-
-    return True
+            await store.async_save({"resource_url": card_url})
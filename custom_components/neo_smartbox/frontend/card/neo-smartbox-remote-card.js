@@ -39,11 +39,46 @@ console.log("NEO Smartbox remote card script is loading...");
       if (!this._hass || !this.config) return;
 
       const entityId = this.config.entity;
+      const deviceId = this._hass.states[entityId]?.attributes.device_id;
 
-      this._hass.callService("remote", "send_command", {
-        entity_id: entityId,
-        command: action,
-      });
+      const callService = () =>
+        this._hass.callService("remote", "send_command", {
+          entity_id: entityId,
+          command: action,
+        });
+
+      if (!deviceId) {
+        callService();
+        return;
+      }
+
+      // Send the press over the integration's websocket command, which
+      // skips the service layer; fall back to the service only when the
+      // command is unknown, e.g. while the integration is still loading
+      this._hass
+        .callWS({
+          type: "neo_smartbox/press",
+          device_id: deviceId,
+          key: action,
+        })
+        .catch((err) => {
+          if (err?.code === "unknown_command") {
+            return callService();
+          }
+          throw err;
+        })
+        .catch((err) => this._showError(err));
+    }
+
+    // Show a failed press as a Home Assistant toast
+    _showError(err) {
+      this.dispatchEvent(
+        new CustomEvent("hass-notification", {
+          detail: { message: err?.message || String(err) },
+          bubbles: true,
+          composed: true,
+        }),
+      );
     }
 
     // Render the card
@@ -0,0 +1,114 @@
+"""Device availability tracking for NEO Smartbox."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    DOMAIN,
+    HEALTH_HOLD_TIMEOUT,
+    HEALTH_OFFLINE_FAILURES,
+    HEALTH_PROBE_INTERVAL,
+    HEALTH_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceOfflineError(HomeAssistantError):
+    """Raised when a command is sent to a device known to be offline."""
+
+
+def signal_health_updated(device_id: str) -> str:
+    """Return the dispatcher signal sent when a device's availability changes."""
+    return f"{DOMAIN}_health_{device_id}"
+
+
+class DeviceHealth:
+    """Availability and health score of a single device.
+
+    A device is offline after several commands in a row failed. Commands
+    to an offline device fail without a request, except for one probe per
+    probe interval whose outcome decides whether the device is back.
+    """
+
+    def __init__(self, hass: HomeAssistant, device_id: str) -> None:
+        """Initialize the health tracker."""
+        self.hass = hass
+        self.device_id = device_id
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self._outcomes: deque[bool] = deque(maxlen=HEALTH_WINDOW)
+        self._probe_at = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Return if the device is considered online."""
+        return self.consecutive_failures < HEALTH_OFFLINE_FAILURES
+
+    @property
+    def score(self) -> int:
+        """Return the share of recent commands that succeeded, in percent."""
+        if not self._outcomes:
+            return 100
+        return round(100 * sum(self._outcomes) / len(self._outcomes))
+
+    def _try_probe(self) -> bool:
+        """Claim the next probe of an offline device if it is due."""
+        now = time.monotonic()
+        if now < self._probe_at:
+            return False
+        self._probe_at = now + HEALTH_PROBE_INTERVAL
+        return True
+
+    async def async_check(self, hold: bool = False) -> None:
+        """Make sure a command may be sent to the device.
+
+        Raises DeviceOfflineError for an offline device. With hold, the
+        command instead waits for the next probe if it is due soon.
+        """
+        if self.available or self._try_probe():
+            return
+
+        if hold and (delay := self._probe_at - time.monotonic()) <= HEALTH_HOLD_TIMEOUT:
+            await asyncio.sleep(delay)
+            if self.available or self._try_probe():
+                return
+
+        self.rejected += 1
+        raise DeviceOfflineError(f"Device {self.device_id} is offline")
+
+    @callback
+    def async_record(self, success: bool) -> None:
+        """Record the outcome of a command sent to the device."""
+        was_available = self.available
+        self._outcomes.append(success)
+        self.consecutive_failures = 0 if success else self.consecutive_failures + 1
+
+        if self.available == was_available:
+            return
+
+        if self.available:
+            _LOGGER.info("Device %s is back online", self.device_id)
+        else:
+            _LOGGER.info("Device %s is offline", self.device_id)
+            self._probe_at = time.monotonic() + HEALTH_PROBE_INTERVAL
+
+        async_dispatcher_send(self.hass, signal_health_updated(self.device_id))
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the health of the device."""
+        return {
+            "available": self.available,
+            "score": self.score,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,276 @@
+"""Channel logo proxy with an on-disk LRU cache."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Iterable
+import hashlib
+from http import HTTPStatus
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    LOGO_CACHE_MAX_BYTES,
+    LOGO_MAX_AGE,
+    LOGO_PREFETCH_CONCURRENCY,
+    LOGO_REVALIDATE_AFTER,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .models import TvChannel
+
+_LOGGER = logging.getLogger(__name__)
+
+LOGO_URL = f"/api/{DOMAIN}/logo/{{channel_id}}"
+
+
+def logo_url(channel_id: str) -> str:
+    """Return the local URL of a channel logo."""
+    return LOGO_URL.format(channel_id=channel_id)
+
+
+class LogoCache:
+    """Size bounded LRU cache of channel logos on disk.
+
+    Metadata (source URL, validators, size) is kept in a Store; the images
+    live in one file per channel. Stale entries are revalidated with
+    If-None-Match and If-Modified-Since.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._directory = Path(hass.config.path(".cache", DOMAIN, "logos"))
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.logos"
+        )
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._size = 0
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._prefetch: asyncio.Task[None] | None = None
+        self.hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+
+    async def async_load(self) -> None:
+        """Load the cache metadata."""
+        data = await self._store.async_load() or {}
+        self._entries = OrderedDict(data.get("entries", {}))
+        self._size = sum(entry["size"] for entry in self._entries.values())
+
+    def _async_save(self) -> None:
+        """Schedule saving the cache metadata."""
+        self._store.async_delay_save(
+            lambda: {"entries": dict(self._entries)}, STORAGE_SAVE_DELAY
+        )
+
+    def _path(self, channel_id: str) -> Path:
+        """Return the file of a cached logo."""
+        return self._directory / hashlib.sha256(channel_id.encode()).hexdigest()
+
+    async def async_ensure(self, channel_id: str, url: str) -> dict[str, Any] | None:
+        """Make sure a logo is cached and fresh, returning its metadata."""
+        lock = self._locks.setdefault(channel_id, asyncio.Lock())
+
+        async with lock:
+            entry = self._entries.get(channel_id)
+
+            if (
+                entry is None
+                or entry["url"] != url
+                or time.time() - entry["checked"] > LOGO_REVALIDATE_AFTER
+            ):
+                entry = await self._async_fetch(channel_id, url, entry)
+
+            return entry
+
+    async def async_get(
+        self, channel_id: str, url: str
+    ) -> tuple[bytes, dict[str, Any]] | None:
+        """Return a logo and its metadata, downloading it if needed."""
+        if (entry := await self.async_ensure(channel_id, url)) is None:
+            return None
+
+        try:
+            body = await self.hass.async_add_executor_job(
+                self._path(channel_id).read_bytes
+            )
+        except OSError:
+            self._async_drop(channel_id)
+            return None
+
+        if channel_id in self._entries:
+            self._entries.move_to_end(channel_id)
+        self.hits += 1
+        return body, entry
+
+    async def _async_fetch(
+        self, channel_id: str, url: str, entry: dict[str, Any] | None
+    ) -> dict[str, Any] | None:
+        """Download or revalidate a logo."""
+        headers = {}
+        if entry is not None and entry["url"] == url:
+            if entry.get("etag"):
+                headers[hdrs.IF_NONE_MATCH] = entry["etag"]
+            if entry.get("last_modified"):
+                headers[hdrs.IF_MODIFIED_SINCE] = entry["last_modified"]
+
+        session = async_get_clientsession(self.hass)
+
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == HTTPStatus.NOT_MODIFIED and entry is not None:
+                    entry["checked"] = time.time()
+                    self.revalidated += 1
+                    self._async_save()
+                    return entry
+
+                response.raise_for_status()
+                body = await response.read()
+                new_entry = {
+                    "url": url,
+                    "etag": response.headers.get(hdrs.ETAG),
+                    "last_modified": response.headers.get(hdrs.LAST_MODIFIED),
+                    "content_type": response.content_type,
+                    "size": len(body),
+                    "digest": hashlib.sha256(body).hexdigest()[:32],
+                    "checked": time.time(),
+                }
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Unable to fetch logo %s: %s", url, err)
+            # Serve what we have rather than nothing
+            return entry
+
+        await self.hass.async_add_executor_job(self._write, channel_id, body)
+
+        if entry is not None:
+            self._size -= entry["size"]
+        self._entries[channel_id] = new_entry
+        # A new download is the most recently used logo, also on a refresh
+        self._entries.move_to_end(channel_id)
+        self._size += new_entry["size"]
+        self.downloads += 1
+
+        await self._async_evict()
+        self._async_save()
+        return new_entry
+
+    def _write(self, channel_id: str, body: bytes) -> None:
+        """Write a logo to disk."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._path(channel_id).write_bytes(body)
+
+    def _async_drop(self, channel_id: str) -> None:
+        """Forget a cached logo."""
+        if entry := self._entries.pop(channel_id, None):
+            self._size -= entry["size"]
+            self._async_save()
+
+    async def _async_evict(self) -> None:
+        """Remove least recently used logos over the size limit."""
+        evicted: list[Path] = []
+
+        while self._size > LOGO_CACHE_MAX_BYTES and len(self._entries) > 1:
+            channel_id, entry = self._entries.popitem(last=False)
+            self._size -= entry["size"]
+            evicted.append(self._path(channel_id))
+
+        if evicted:
+            await self.hass.async_add_executor_job(_unlink_all, evicted)
+
+    def async_prefetch(self, channels: Iterable[TvChannel]) -> None:
+        """Download the logos of a channel list in the background."""
+        if self._prefetch is not None and not self._prefetch.done():
+            self._prefetch.cancel()
+
+        self._prefetch = self.hass.async_create_background_task(
+            self._async_prefetch(
+                [(channel.id, channel.logo) for channel in channels if channel.logo]
+            ),
+            f"{DOMAIN} logo prefetch",
+        )
+
+    async def _async_prefetch(self, logos: list[tuple[str, str]]) -> None:
+        """Download logos with bounded concurrency."""
+        semaphore = asyncio.Semaphore(LOGO_PREFETCH_CONCURRENCY)
+
+        async def _fetch(channel_id: str, url: str) -> None:
+            async with semaphore:
+                await self.async_ensure(channel_id, url)
+
+        await asyncio.gather(*(_fetch(channel_id, url) for channel_id, url in logos))
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "logos": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "downloads": self.downloads,
+        }
+
+
+def _unlink_all(paths: list[Path]) -> None:
+    """Remove files, ignoring the ones that are already gone."""
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+class LogoView(HomeAssistantView):
+    """Serve cached channel logos."""
+
+    url = LOGO_URL
+    name = f"api:{DOMAIN}:logo"
+    requires_auth = False
+
+    def __init__(self, logo_cache: LogoCache) -> None:
+        """Initialize the view."""
+        self._logo_cache = logo_cache
+
+    async def get(self, request: web.Request, channel_id: str) -> web.StreamResponse:
+        """Return the logo of a known channel."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+
+        channel = next(
+            (
+                channel
+                for coordinator in hass.data.get(DOMAIN, {}).values()
+                if (channel := coordinator.channel_index.get_by_id(channel_id))
+            ),
+            None,
+        )
+
+        if channel is None or not channel.logo:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        if (
+            result := await self._logo_cache.async_get(channel_id, channel.logo)
+        ) is None:
+            return web.Response(status=HTTPStatus.BAD_GATEWAY)
+
+        body, entry = result
+        etag = f'"{entry["digest"]}"'
+        headers = {
+            hdrs.CACHE_CONTROL: f"public, max-age={LOGO_MAX_AGE}",
+            hdrs.ETAG: etag,
+        }
+
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        return web.Response(
+            body=body, content_type=entry["content_type"], headers=headers
+        )
@@ -0,0 +1,232 @@
+"""Channel browser for NEO Smartbox devices."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.media_player import (
+    BrowseError,
+    BrowseMedia,
+    MediaClass,
+    MediaPlayerEntity,
+    MediaPlayerEntityFeature,
+    MediaPlayerState,
+    MediaType,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import BROWSE_PAGE_SIZE, DOMAIN
+from .coordinator import NeoSmartboxUpdateCoordinator
+from .entity import get_device_info
+from .health import signal_health_updated
+from .logos import logo_url
+from .models import NeoSmartboxDevice, TvChannel
+from .scheduler import RequestPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+ROOT_ID = "root"
+FAVORITES_ID = "favorites"
+GROUP_PREFIX = "group"
+
+
+def _page_id(prefix: str, page: int, name: str = "") -> str:
+    """Return the content id of one page of a channel folder."""
+    return f"{prefix}:{page}:{name}"
+
+
+def _sort_key(channel: TvChannel) -> tuple[int, str]:
+    """Sort channels by number, non numeric numbers last."""
+    number = str(channel.number)
+    return (int(number), "") if number.isdigit() else (1 << 31, number)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up NEO Smartbox channel browsers based on a config entry."""
+    coordinator: NeoSmartboxUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    known_ids = {device.id for device in coordinator.data}
+
+    async_add_entities(
+        NeoSmartboxMediaPlayer(coordinator, device) for device in coordinator.data
+    )
+
+    @callback
+    def _async_add_devices() -> None:
+        """Add browsers for new devices and forget removed ones."""
+        known_ids.difference_update(coordinator.device_diff.removed)
+        if added := coordinator.device_diff.added - known_ids:
+            known_ids.update(added)
+            async_add_entities(
+                NeoSmartboxMediaPlayer(coordinator, coordinator.devices[device_id])
+                for device_id in added
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_devices))
+
+
+class NeoSmartboxMediaPlayer(
+    CoordinatorEntity[NeoSmartboxUpdateCoordinator], MediaPlayerEntity
+):
+    """Browse the channel catalogue and switch a device to a channel."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "channels"
+    _attr_state = MediaPlayerState.ON
+    _attr_supported_features = (
+        MediaPlayerEntityFeature.BROWSE_MEDIA | MediaPlayerEntityFeature.PLAY_MEDIA
+    )
+
+    def __init__(
+        self, coordinator: NeoSmartboxUpdateCoordinator, device: NeoSmartboxDevice
+    ) -> None:
+        """Initialize the channel browser."""
+        super().__init__(coordinator)
+        self.device_id = device.id
+        self._attr_unique_id = f"{DOMAIN}_{device.id}_channels"
+        self._attr_device_info = get_device_info(device)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow availability changes of the device."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                signal_health_updated(self.device_id),
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.is_available(self.device_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Nothing to update, the state does not follow the device list."""
+
+    async def async_play_media(
+        self, media_type: MediaType | str, media_id: str, **kwargs: Any
+    ) -> None:
+        """Switch the device to a channel."""
+        await self.coordinator.async_navigate(
+            device_id=self.device_id,
+            action=f"app://player/livetv/id/{media_id}",
+            priority=RequestPriority.INTERACTIVE,
+        )
+
+    async def async_browse_media(
+        self,
+        media_content_type: MediaType | str | None = None,
+        media_content_id: str | None = None,
+    ) -> BrowseMedia:
+        """Return one level of the channel catalogue."""
+        await self.coordinator.async_get_channels()
+        index = self.coordinator.channel_index
+
+        if not media_content_id or media_content_id == ROOT_ID:
+            return self._browse_root()
+
+        prefix, _, rest = media_content_id.partition(":")
+        page, _, group = rest.partition(":")
+
+        if not page.isdigit():
+            raise BrowseError(f"Media not found: {media_content_id}")
+
+        if prefix == FAVORITES_ID:
+            return self._browse_channels(
+                FAVORITES_ID, "", "Favourites", index.favorites, int(page)
+            )
+
+        if prefix != GROUP_PREFIX:
+            raise BrowseError(f"Media not found: {media_content_id}")
+
+        return self._browse_channels(
+            GROUP_PREFIX, group, group, index.get_group(group), int(page)
+        )
+
+    def _browse_root(self) -> BrowseMedia:
+        """Return the favourites and channel groups, without their channels."""
+        index = self.coordinator.channel_index
+        children = []
+
+        if index.favorites:
+            children.append(self._directory(_page_id(FAVORITES_ID, 0), "Favourites"))
+
+        children.extend(
+            self._directory(_page_id(GROUP_PREFIX, 0, group), group)
+            for group in sorted(index.groups)
+        )
+
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=ROOT_ID,
+            media_content_type=MediaType.CHANNELS,
+            title="Channels",
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=MediaClass.DIRECTORY,
+        )
+
+    def _browse_channels(
+        self,
+        prefix: str,
+        name: str,
+        title: str,
+        channels: list[TvChannel],
+        page: int,
+    ) -> BrowseMedia:
+        """Return one page of channels, with a link to the next page."""
+        channels.sort(key=_sort_key)
+        start = page * BROWSE_PAGE_SIZE
+        children = [
+            BrowseMedia(
+                media_class=MediaClass.CHANNEL,
+                media_content_id=channel.id,
+                media_content_type=MediaType.CHANNEL,
+                title=f"{channel.number} - {channel.title}",
+                can_play=True,
+                can_expand=False,
+                thumbnail=logo_url(channel.id) if channel.logo else None,
+            )
+            for channel in channels[start : start + BROWSE_PAGE_SIZE]
+        ]
+
+        if start + BROWSE_PAGE_SIZE < len(channels):
+            children.append(
+                self._directory(_page_id(prefix, page + 1, name), "More channels")
+            )
+
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=_page_id(prefix, page, name),
+            media_content_type=MediaType.CHANNELS,
+            title=title,
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=MediaClass.CHANNEL,
+        )
+
+    @staticmethod
+    def _directory(content_id: str, title: str) -> BrowseMedia:
+        """Return a directory whose children are loaded when opened."""
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id=content_id,
+            media_content_type=MediaType.CHANNELS,
+            title=title,
+            can_play=False,
+            can_expand=True,
+        )
@@ -0,0 +1,154 @@
+"""Request instrumentation for the NEO Smartbox API client."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+import time
+from typing import Any
+
+from .const import LATENCY_BUCKETS_MS
+
+
+class EndpointMetrics:
+    """Latency histogram and counters of a single API endpoint."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the metrics."""
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, latency_ms: float, error: bool) -> None:
+        """Record a finished request."""
+        self.requests += 1
+        self.total_ms += latency_ms
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        if error:
+            self.errors += 1
+
+    def add_bytes_sent(self, count: int) -> None:
+        """Count bytes of a request body."""
+        self.bytes_sent += count
+
+    def add_bytes_received(self, count: int) -> None:
+        """Count bytes of a response body."""
+        self.bytes_received += count
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile."""
+        if not self.requests:
+            return None
+
+        target = self.requests * fraction
+        seen = 0
+        for bound, count in zip((*LATENCY_BUCKETS_MS, None), self.buckets, strict=True):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the metrics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "mean_ms": round(self.total_ms / self.requests, 1)
+            if self.requests
+            else None,
+            "p95_ms": self.percentile(0.95),
+            "histogram_ms": {
+                f"<={bound}" if bound is not None else "inf": count
+                for bound, count in zip(
+                    (*LATENCY_BUCKETS_MS, None), self.buckets, strict=True
+                )
+            },
+        }
+
+
+class PollMetrics:
+    """Counters of the device list polling."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.polls = 0
+        self.polls_avoided = 0
+        self.payloads_unchanged = 0
+        self.bytes_parsed = 0
+        self._parsed: deque[tuple[float, int]] = deque()
+
+    def add_bytes_parsed(self, count: int) -> None:
+        """Count bytes of a response body that had to be parsed."""
+        self.bytes_parsed += count
+        self._parsed.append((time.monotonic(), count))
+
+    @property
+    def bytes_parsed_per_hour(self) -> int:
+        """Return the bytes parsed within the last hour."""
+        cutoff = time.monotonic() - 3600
+        while self._parsed and self._parsed[0][0] < cutoff:
+            self._parsed.popleft()
+        return sum(count for _, count in self._parsed)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the metrics."""
+        return {
+            "polls": self.polls,
+            "polls_avoided": self.polls_avoided,
+            "payloads_unchanged": self.payloads_unchanged,
+            "bytes_parsed": self.bytes_parsed,
+            "bytes_parsed_per_hour": self.bytes_parsed_per_hour,
+        }
+
+
+class ApiMetrics:
+    """Metrics of all endpoints of an API client."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, url: str) -> EndpointMetrics:
+        """Return the metrics of the endpoint behind a URL."""
+        name = url.rsplit("/", 1)[-1]
+        if (metrics := self.endpoints.get(name)) is None:
+            metrics = self.endpoints[name] = EndpointMetrics(name)
+        return metrics
+
+    @property
+    def requests(self) -> int:
+        """Return the number of finished requests."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests in flight."""
+        return sum(metrics.in_flight for metrics in self.endpoints.values())
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a latency percentile over all endpoints."""
+        combined = EndpointMetrics("all")
+        for metrics in self.endpoints.values():
+            combined.requests += metrics.requests
+            combined.buckets = [
+                total + count
+                for total, count in zip(combined.buckets, metrics.buckets, strict=True)
+            ]
+        return combined.percentile(fraction)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the metrics of all endpoints."""
+        return {name: metrics.diagnostics() for name, metrics in self.endpoints.items()}
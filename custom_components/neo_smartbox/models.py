@@ -2,20 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
 from enum import Enum
+import hashlib
 import logging
+import sys
+import time
+from typing import Any
 
 import aiohttp
 
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util.json import json_loads
 
 from .const import (
     API_DEVICE_LIST,
     API_GET_SMART_TV_LIST,
     API_NAVIGATE_ACTION,
     API_SEND_KEY_ACTION,
+    API_MAX_RETRIES,
     API_ZAP_LIST,
+    TRACE_SAMPLE_EVERY,
+)
+from .metrics import ApiMetrics, EndpointMetrics, PollMetrics
+from .scheduler import RequestPriority, RequestScheduler
+from .throttle import (
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    parse_retry_after,
+    retry_delay,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,7 +46,7 @@ class NeoDeviceType(Enum):
     SMART_TV = "dt_tv"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NeoSmartboxDevice:
     """NEO Smartbox device representation."""
 
@@ -37,7 +55,7 @@ class NeoSmartboxDevice:
     type: NeoDeviceType
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TvChannel:
     """TV channel representation."""
 
@@ -48,16 +66,74 @@ class TvChannel:
     favorite: bool
     group: str
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TvChannel:
+        """Create a channel from its API or cached form.
+
+        Group names repeat across the whole line-up, so a single interned
+        copy is shared by all channels of a group.
+        """
+        return cls(
+            data["id"],
+            data["title"],
+            data["number"],
+            data["logo"],
+            data["favorite"],
+            sys.intern(data["group"]),
+        )
+
+
+def _request_finished(metrics: EndpointMetrics) -> None:
+    """Mark a request as no longer in flight."""
+    metrics.in_flight -= 1
+
+
+class PartialDeviceListError(Exception):
+    """Raised when only some of the device lists could be fetched."""
+
+    def __init__(
+        self,
+        devices: list[NeoSmartboxDevice],
+        failed: dict[NeoDeviceType, Exception],
+    ) -> None:
+        """Initialize the error with the devices that were fetched."""
+        super().__init__(
+            "Error getting devices of type: "
+            + ", ".join(device_type.value for device_type in failed)
+        )
+        self.devices = devices
+        self.failed = failed
+
 
 class NeoSmartboxApiClient:
     """API client for NEO Smartbox."""
 
-    def __init__(self, api_key: str, session: aiohttp.ClientSession) -> None:
-        """Initialize the API client."""
+    def __init__(
+        self,
+        api_key: str,
+        session: aiohttp.ClientSession | Callable[[], aiohttp.ClientSession],
+        scheduler: RequestScheduler | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ) -> None:
+        """Initialize the API client.
+
+        The session may be given as a callable, which is asked for the
+        current session on every request. Clients of several accounts can
+        share a scheduler and rate limiter to stay within one request budget.
+        """
         self.api_key = api_key
-        self.session = session
+        self._session = session
+        self.scheduler = scheduler or RequestScheduler()
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.circuit_breaker = CircuitBreaker()
+        self.metrics = ApiMetrics()
+        self.polling = PollMetrics()
+        self._device_payloads: dict[str, tuple[bytes, list[NeoSmartboxDevice]]] = {}
+        self._device_lists: tuple[list[NeoSmartboxDevice], ...] = ()
+        self._devices: list[NeoSmartboxDevice] = []
         self.headers = {
             "accept": "application/json, text/plain, */*",
+            "accept-encoding": "gzip, deflate",
             "accept-language": "en-US,en;q=0.9,sl;q=0.8",
             "authorization": f"APIGW-AUTH-TOK {api_key}",
             "content-type": "application/json",
@@ -67,38 +143,196 @@ class NeoSmartboxApiClient:
             "x-layout-id": "si_titan_flutter&platform=web",
         }
 
-    async def get_all_devices(self) -> list[NeoSmartboxDevice]:
-        """Get all devices."""
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session to send the next request with."""
+        if isinstance(self._session, aiohttp.ClientSession):
+            return self._session
+        return self._session()
 
-        stbs = await self._get_stb_list()
-        smart_tvs = await self._get_smart_tv_list()
+    @asynccontextmanager
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        priority: RequestPriority,
+        idempotent: bool = False,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request once the rate limiter and scheduler allow it.
+
+        Idempotent requests are retried with jittered backoff on connection
+        errors, 429 and 5xx responses. The response is released when the
+        context exits.
+        """
+        attempt = 0
+        metrics = self.metrics.endpoint(url)
+
+        while True:
+            self.circuit_breaker.check()
+            queued_at = time.monotonic()
+            await self.rate_limiter.async_acquire(priority)
+
+            async with AsyncExitStack() as stack:
+                await stack.enter_async_context(
+                    self.scheduler.slot(priority, queued_at)
+                )
+                # Claimed only now, so a trial never waits for a token or slot
+                stack.enter_context(self.circuit_breaker.attempt())
+
+                metrics.in_flight += 1
+                stack.callback(_request_finished, metrics)
+                start = time.monotonic()
+
+                try:
+                    response = await stack.enter_async_context(
+                        self.session.request(
+                            method,
+                            url,
+                            headers=self.headers,
+                            trace_request_ctx={
+                                "metrics": metrics,
+                                "priority": priority,
+                            },
+                            **kwargs,
+                        )
+                    )
+                except (aiohttp.ClientConnectionError, TimeoutError):
+                    metrics.record((time.monotonic() - start) * 1000, error=True)
+                    self.circuit_breaker.record_failure()
+                    if not idempotent or attempt >= API_MAX_RETRIES:
+                        raise
+                    delay = retry_delay(attempt)
+                else:
+                    latency_ms = (time.monotonic() - start) * 1000
+                    metrics.record(latency_ms, error=response.status >= 400)
+
+                    if (
+                        metrics.requests % TRACE_SAMPLE_EVERY == 1
+                        and _LOGGER.isEnabledFor(logging.DEBUG)
+                    ):
+                        _LOGGER.debug(
+                            "%s %s: status %s in %.1f ms",
+                            method.upper(),
+                            metrics.name,
+                            response.status,
+                            latency_ms,
+                        )
+
+                    if response.status == 429:
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                        self.rate_limiter.record_throttled(retry_after)
+                        delay = max(retry_delay(attempt), retry_after or 0)
+                    elif response.status >= 500:
+                        self.circuit_breaker.record_failure()
+                        delay = retry_delay(attempt)
+                    else:
+                        self.circuit_breaker.record_success()
+                        self.rate_limiter.record_success()
+                        delay = None
+
+                    if delay is None or not idempotent or attempt >= API_MAX_RETRIES:
+                        yield response
+                        return
+
+            attempt += 1
+            _LOGGER.debug("Retrying %s in %.1f seconds", url, delay)
+            await asyncio.sleep(delay)
 
-        return stbs + smart_tvs
+    async def get_all_devices(self) -> list[NeoSmartboxDevice]:
+        """Get all devices.
+
+        Both device lists are requested concurrently. If only one of them
+        fails, a PartialDeviceListError carrying the other list is raised.
+        If neither list changed, the previously returned list is returned.
+        """
+
+        results = await asyncio.gather(
+            self._get_stb_list(),
+            self._get_smart_tv_list(),
+            return_exceptions=True,
+        )
+
+        devices: list[NeoSmartboxDevice] = []
+        failed: dict[NeoDeviceType, Exception] = {}
+
+        for device_type, result in zip(
+            (NeoDeviceType.STB, NeoDeviceType.SMART_TV), results, strict=True
+        ):
+            if isinstance(result, ConfigEntryAuthFailed) or (
+                isinstance(result, BaseException) and not isinstance(result, Exception)
+            ):
+                raise result
+            if isinstance(result, Exception):
+                failed[device_type] = result
+            else:
+                devices.extend(result)
+
+        if len(failed) == len(results):
+            raise next(iter(failed.values()))
+
+        if failed:
+            raise PartialDeviceListError(devices, failed)
+
+        if len(results) == len(self._device_lists) and all(
+            result is previous
+            for result, previous in zip(results, self._device_lists, strict=True)
+        ):
+            return self._devices
+
+        self._device_lists = tuple(results)
+        self._devices = devices
+        return devices
+
+    def _parse_devices(
+        self,
+        url: str,
+        body: bytes,
+        parse: Callable[[Any], list[NeoSmartboxDevice]],
+    ) -> list[NeoSmartboxDevice]:
+        """Parse a device list, reusing the last result if the body is unchanged."""
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+
+        if (cached := self._device_payloads.get(url)) and cached[0] == digest:
+            self.polling.payloads_unchanged += 1
+            return cached[1]
+
+        self.polling.add_bytes_parsed(len(body))
+        devices = parse(json_loads(body))
+        self._device_payloads[url] = (digest, devices)
+        return devices
 
     async def _get_stb_list(self) -> list[NeoSmartboxDevice]:
         """Get all STB devices."""
         try:
-            stbResponse = await self.session.post(
+            async with self._request(
+                "post",
                 API_DEVICE_LIST,
-                headers=self.headers,
+                RequestPriority.POLL,
+                idempotent=True,
                 json={},
-            )
-
-            if stbResponse.status == 403:
-                _LOGGER.error("Authentication error when getting devices")
-                raise ConfigEntryAuthFailed("Invalid API key")
+            ) as stbResponse:
+                if stbResponse.status == 403:
+                    _LOGGER.error("Authentication error when getting devices")
+                    raise ConfigEntryAuthFailed("Invalid API key")
 
-            stbResponse.raise_for_status()
-            data = await stbResponse.json()
+                stbResponse.raise_for_status()
+                body = await stbResponse.read()
 
-            return [
-                NeoSmartboxDevice(
-                    id=item["device_id"],
-                    name=item["name"],
-                    type=NeoDeviceType.STB,
-                )
-                for item in data.get("items", [])
-            ]
+            return self._parse_devices(
+                API_DEVICE_LIST,
+                body,
+                lambda data: [
+                    NeoSmartboxDevice(
+                        id=item["device_id"],
+                        name=item["name"],
+                        type=NeoDeviceType.STB,
+                    )
+                    for item in data.get("items", [])
+                ],
+            )
 
         except aiohttp.ClientResponseError as err:
             if err.status == 403:
@@ -110,27 +344,32 @@ class NeoSmartboxApiClient:
     async def _get_smart_tv_list(self) -> list[NeoSmartboxDevice]:
         """Get all Smart TVs."""
         try:
-            response = await self.session.get(
+            async with self._request(
+                "get",
                 API_GET_SMART_TV_LIST,
-                headers=self.headers,
+                RequestPriority.POLL,
+                idempotent=True,
                 json={},
-            )
-
-            if response.status == 403:
-                _LOGGER.error("Authentication error when getting devices")
-                raise ConfigEntryAuthFailed("Invalid API key")
+            ) as response:
+                if response.status == 403:
+                    _LOGGER.error("Authentication error when getting devices")
+                    raise ConfigEntryAuthFailed("Invalid API key")
 
-            response.raise_for_status()
-            data = await response.json()
+                response.raise_for_status()
+                body = await response.read()
 
-            return [
-                NeoSmartboxDevice(
-                    id=item["uuid"],
-                    name=item["device_name"],
-                    type=NeoDeviceType.SMART_TV,
-                )
-                for item in data.get("devices", [])
-            ]
+            return self._parse_devices(
+                API_GET_SMART_TV_LIST,
+                body,
+                lambda data: [
+                    NeoSmartboxDevice(
+                        id=item["uuid"],
+                        name=item["device_name"],
+                        type=NeoDeviceType.SMART_TV,
+                    )
+                    for item in data.get("devices", [])
+                ],
+            )
 
         except aiohttp.ClientResponseError as err:
             if err.status == 403:
@@ -145,8 +384,14 @@ class NeoSmartboxApiClient:
         key_name: str,
         long_press: bool = False,
         key_repeat: int = 0,
+        priority: RequestPriority = RequestPriority.BULK,
     ) -> bool:
-        """Send key action to device."""
+        """Send key action to device.
+
+        Returns False if the device rejected the command. Throttling, server
+        and connection errors are raised, as they are not caused by the
+        device.
+        """
         try:
             payload = {
                 "device_id": device_id,
@@ -155,53 +400,67 @@ class NeoSmartboxApiClient:
                 "long_press": long_press,
             }
 
-            _LOGGER.info("Sending command: %s", payload)
-
-            response = await self.session.post(
+            async with self._request(
+                "post",
                 API_SEND_KEY_ACTION,
-                headers=self.headers,
+                priority,
                 json=payload,
-            )
-
-            if response.status == 403:
-                _LOGGER.error("Authentication error when sending command")
-                raise ConfigEntryAuthFailed("Invalid API key")
+            ) as response:
+                if response.status == 403:
+                    _LOGGER.error("Authentication error when sending command")
+                    raise ConfigEntryAuthFailed("Invalid API key")
 
-            response.raise_for_status()
+                response.raise_for_status()
         except aiohttp.ClientResponseError as err:
             if err.status == 403:
                 _LOGGER.debug("Authentication error when sending command")
                 raise ConfigEntryAuthFailed("Invalid API key") from err
+            if err.status == 429 or err.status >= 500:
+                # Throttling and server errors say nothing about the device
+                _LOGGER.debug("API error when sending command: %s", err)
+                raise
             _LOGGER.debug("Error sending command: %s", err)
             return False
         else:
             return True
 
-    async def navigate_action(self, device_id: str, action: str) -> bool:
-        """Send navigate action to device."""
+    async def navigate_action(
+        self,
+        device_id: str,
+        action: str,
+        priority: RequestPriority = RequestPriority.BULK,
+    ) -> bool:
+        """Send navigate action to device.
+
+        Returns False if the device rejected the command. Throttling, server
+        and connection errors are raised, as they are not caused by the
+        device.
+        """
         try:
             payload = {
                 "device_id": device_id,
                 "navigate_path": action,
             }
 
-            _LOGGER.info("Sending command: %s", payload)
-
-            response = await self.session.post(
+            async with self._request(
+                "post",
                 API_NAVIGATE_ACTION,
-                headers=self.headers,
+                priority,
                 json=payload,
-            )
+            ) as response:
+                if response.status == 403:
+                    _LOGGER.error("Authentication error when sending command")
+                    raise ConfigEntryAuthFailed("Invalid API key")
 
-            if response.status == 403:
-                _LOGGER.error("Authentication error when sending command")
-                raise ConfigEntryAuthFailed("Invalid API key")
-
-            response.raise_for_status()
+                response.raise_for_status()
         except aiohttp.ClientResponseError as err:
             if err.status == 403:
                 _LOGGER.debug("Authentication error when sending command")
                 raise ConfigEntryAuthFailed("Invalid API key") from err
+            if err.status == 429 or err.status >= 500:
+                # Throttling and server errors say nothing about the device
+                _LOGGER.debug("API error when sending command: %s", err)
+                raise
             _LOGGER.debug("Error sending command: %s", err)
             return False
         else:
@@ -210,29 +469,22 @@ class NeoSmartboxApiClient:
     async def get_channel_list(self) -> list[TvChannel]:
         """Get channel list."""
         try:
-            response = await self.session.get(
+            async with self._request(
+                "get",
                 API_ZAP_LIST,
-                headers=self.headers,
+                RequestPriority.POLL,
+                idempotent=True,
                 json={},
-            )
+            ) as response:
+                if response.status == 403:
+                    _LOGGER.error("Authentication error when getting channel list")
+                    raise ConfigEntryAuthFailed("Invalid API key")
 
-            if response.status == 403:
-                _LOGGER.error("Authentication error when getting channel list")
-                raise ConfigEntryAuthFailed("Invalid API key")
-
-            response.raise_for_status()
-            data = await response.json()
+                response.raise_for_status()
+                data = await response.json()
 
             return [
-                TvChannel(
-                    id=item["channel"]["id"],
-                    title=item["channel"]["title"],
-                    number=item["channel"]["number"],
-                    logo=item["channel"]["logo"],
-                    favorite=item["channel"]["favorite"],
-                    group=item["channel"]["group"],
-                )
-                for item in data.get("data", [])
+                TvChannel.from_dict(item["channel"]) for item in data.get("data", [])
             ]
 
         except aiohttp.ClientResponseError as err:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
 import logging
 from typing import Any
@@ -12,14 +13,18 @@ from homeassistant.components.remote import RemoteEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, REMOTE_COMMANDS
 from .coordinator import NeoSmartboxUpdateCoordinator
-from .models import NeoDeviceType, NeoSmartboxDevice
+from .entity import get_device_info
+from .health import signal_health_updated
+from .models import NeoSmartboxDevice
+from .scheduler import RequestPriority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,9 +46,42 @@ async def async_setup_entry(
     coordinator: NeoSmartboxUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     entities = [NeoSmartboxRemote(coordinator, device) for device in coordinator.data]
+    known_ids = {entity.device_id for entity in entities}
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_remove_devices() -> None:
+        """Add entities for new devices and remove vanished devices.
+
+        The coordinator only reports a device as removed once it was missing
+        from several device lists in a row.
+        """
+        diff = coordinator.device_diff
+
+        if added := diff.added - known_ids:
+            known_ids.update(added)
+            async_add_entities(
+                NeoSmartboxRemote(coordinator, coordinator.devices[device_id])
+                for device_id in added
+            )
+
+        if not (removed := diff.removed & known_ids):
+            return
+
+        known_ids.difference_update(removed)
+        device_registry = dr.async_get(hass)
+
+        for device_id in removed:
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, device_id)}
+            ):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
+                )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_remove_devices))
+
 
 class NeoSmartboxRemote(CoordinatorEntity[NeoSmartboxUpdateCoordinator], RemoteEntity):
     """Representation of a NEO Smartbox remote."""
@@ -59,25 +97,33 @@ class NeoSmartboxRemote(CoordinatorEntity[NeoSmartboxUpdateCoordinator], RemoteE
         self.device_id = device.id
         self._attr_unique_id = f"{DOMAIN}_{self.device_id}"
         self._attr_name = device.name
-        self._attr_is_on = True
         # self._attr_commands_encoding = list(NEO_APP_COMMANDS.keys())
 
     @property
     def device_info(self) -> DeviceInfo | None:
         """Return device info."""
-        return {
-            "identifiers": {(DOMAIN, self.device_id)},
-            "name": self._device.name,
-            "manufacturer": "Telekom Slovenia",
-            "model": "NEO Smartbox"
-            if self._device.type == NeoDeviceType.STB
-            else "NEO TV Lite",
-        }
+        return get_device_info(self._device)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow availability changes of the device."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                signal_health_updated(self.device_id),
+                self.async_write_ha_state,
+            )
+        )
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return True
+        return self.coordinator.is_available(self.device_id)
+
+    @property
+    def is_on(self) -> bool:
+        """Return if the device is on, as far as the cloud can tell."""
+        return self.coordinator.is_available(self.device_id)
 
     @property
     def commands(self) -> list[str]:
@@ -91,17 +137,20 @@ class NeoSmartboxRemote(CoordinatorEntity[NeoSmartboxUpdateCoordinator], RemoteE
             # "available_commands": list(NEO_APP_COMMANDS.keys()),
             # "command_descriptions": NEO_APP_COMMANDS,
             "device_id": self.device_id,
+            "health_score": health.score
+            if (health := self.coordinator.health.get(self.device_id))
+            else None,
         }
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        for device in self.coordinator.data:
-            if device.id == self.device_id:
-                self._device = device
-                self._attr_is_on = True
-                self._attr_current_activity = None
-                break
+        if self.device_id not in self.coordinator.device_diff.changed:
+            self.coordinator.suppressed_writes += 1
+            return
+
+        self._device = self.coordinator.devices[self.device_id]
+        self._attr_current_activity = None
         self.async_write_ha_state()
 
     async def async_send_command(self, command: Iterable[str], **kwargs: Any) -> None:
@@ -114,14 +163,21 @@ class NeoSmartboxRemote(CoordinatorEntity[NeoSmartboxUpdateCoordinator], RemoteE
         if not commands:
             return
 
+        sends = []
         for single_command in commands:
             if single_command in REMOTE_COMMANDS:
                 api_command = REMOTE_COMMANDS[single_command]
-                await self.coordinator.api_client.send_key_action(
-                    device_id=self.device_id,
-                    key_name=api_command,
-                    long_press=long_press,
-                    key_repeat=key_repeat,
+                sends.append(
+                    self.coordinator.async_send_key(
+                        device_id=self.device_id,
+                        key_name=api_command,
+                        long_press=long_press,
+                        key_repeat=key_repeat,
+                        priority=RequestPriority.INTERACTIVE,
+                    )
                 )
             else:
                 _LOGGER.warning("Unsupported command: %s", single_command)
+
+        # Queue all presses at once so that repeated keys can be coalesced
+        await asyncio.gather(*sends)
@@ -0,0 +1,114 @@
+"""Request scheduling for the NEO Smartbox API client."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+import time
+from typing import Any
+
+from .const import LATENCY_SAMPLES, MAX_CONCURRENT_REQUESTS
+
+
+class RequestPriority(IntEnum):
+    """Priority classes for API requests, lowest value is served first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+    POLL = 2
+
+
+class RequestScheduler:
+    """Limit concurrent API requests and serve waiting ones by priority.
+
+    Requests of the same priority are served in the order they arrived.
+    The time each request waited before it was sent, for a rate limiter
+    token and then for a slot, is recorded per priority class.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS) -> None:
+        """Initialize the scheduler."""
+        self._max_concurrent = max(max_concurrent, 1)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wait_times: dict[RequestPriority, deque[float]] = {
+            priority: deque(maxlen=LATENCY_SAMPLES) for priority in RequestPriority
+        }
+        self._counts: dict[RequestPriority, int] = dict.fromkeys(RequestPriority, 0)
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: RequestPriority, queued_at: float | None = None
+    ) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the context.
+
+        The recorded wait starts at queued_at, the monotonic time the
+        request started waiting for a rate limiter token, if given.
+        """
+        start = time.monotonic() if queued_at is None else queued_at
+        await self._acquire(priority)
+        self._wait_times[priority].append(time.monotonic() - start)
+        self._counts[priority] += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        """Wait for a free slot."""
+        if self._active < self._max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiter or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._active -= 1
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return per-priority queue wait statistics in milliseconds."""
+        stats: dict[str, Any] = {
+            "active": self._active,
+            "waiting": sum(not future.done() for _, _, future in self._waiters),
+        }
+
+        for priority, samples in self._wait_times.items():
+            ordered = sorted(samples)
+            stats[priority.name.lower()] = {
+                "requests": self._counts[priority],
+                "p50_wait_ms": _percentile(ordered, 0.5),
+                "p95_wait_ms": _percentile(ordered, 0.95),
+                "max_wait_ms": round(ordered[-1] * 1000, 1) if ordered else None,
+            }
+
+        return stats
+
+
+def _percentile(ordered: list[float], fraction: float) -> float | None:
+    """Return a percentile of sorted samples in milliseconds."""
+    if not ordered:
+        return None
+    index = min(int(len(ordered) * fraction), len(ordered) - 1)
+    return round(ordered[index] * 1000, 1)
@@ -0,0 +1,138 @@
+"""Diagnostic sensors for the NEO Smartbox API client."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, UPDATE_INTERVAL
+from .coordinator import NeoSmartboxUpdateCoordinator
+from .models import NeoSmartboxApiClient
+
+
+@dataclass(frozen=True, kw_only=True)
+class NeoSmartboxSensorEntityDescription(SensorEntityDescription):
+    """Describes a NEO Smartbox API sensor."""
+
+    value_fn: Callable[[NeoSmartboxApiClient], float | int | None]
+
+
+SENSORS: tuple[NeoSmartboxSensorEntityDescription, ...] = (
+    NeoSmartboxSensorEntityDescription(
+        key="api_latency_p95",
+        translation_key="api_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda client: client.metrics.percentile(0.95),
+    ),
+    NeoSmartboxSensorEntityDescription(
+        key="api_requests",
+        translation_key="api_requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.requests,
+    ),
+    NeoSmartboxSensorEntityDescription(
+        key="api_errors",
+        translation_key="api_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.errors,
+    ),
+    NeoSmartboxSensorEntityDescription(
+        key="polls_avoided",
+        translation_key="polls_avoided",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.polling.polls_avoided,
+    ),
+    NeoSmartboxSensorEntityDescription(
+        key="bytes_parsed_per_hour",
+        translation_key="bytes_parsed_per_hour",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda client: client.polling.bytes_parsed_per_hour,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up NEO Smartbox diagnostic sensors based on a config entry."""
+    coordinator: NeoSmartboxUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities(
+        NeoSmartboxApiSensor(coordinator, entry, description) for description in SENSORS
+    )
+
+
+class NeoSmartboxApiSensor(
+    CoordinatorEntity[NeoSmartboxUpdateCoordinator], SensorEntity
+):
+    """Diagnostic sensor reporting API client metrics."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    entity_description: NeoSmartboxSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: NeoSmartboxUpdateCoordinator,
+        entry: ConfigEntry,
+        description: NeoSmartboxSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="NEO cloud",
+            manufacturer="Telekom Slovenia",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Also refresh the metrics when the device list did not change."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_refresh_metrics,
+                timedelta(seconds=UPDATE_INTERVAL),
+            )
+        )
+
+    @callback
+    def _async_refresh_metrics(self, now: datetime) -> None:
+        """Write the current metrics."""
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric value."""
+        return self.entity_description.value_fn(self.coordinator.api_client)
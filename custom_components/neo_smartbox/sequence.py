@@ -0,0 +1,107 @@
+"""Remote command sequences for NEO Smartbox."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.helpers import config_validation as cv
+
+from .const import MAX_SEQUENCE_DELAY, MAX_SEQUENCE_STEPS, REMOTE_COMMANDS
+
+ATTR_SEQUENCE = "sequence"
+
+KEY_STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required("key"): vol.In(REMOTE_COMMANDS),
+        vol.Optional("long_press", default=False): cv.boolean,
+        vol.Optional("repeat", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_SEQUENCE_STEPS)
+        ),
+    }
+)
+
+NAVIGATE_STEP_SCHEMA = vol.Schema({vol.Required("navigate"): cv.string})
+
+DELAY_STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required("delay"): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_SEQUENCE_DELAY)
+        )
+    }
+)
+
+
+def _validate_step(value: Any) -> dict[str, Any]:
+    """Validate a single step, a plain string is a key press."""
+    if isinstance(value, str):
+        value = {"key": value}
+
+    if not isinstance(value, dict):
+        raise vol.Invalid("Sequence step must be a key or a mapping")
+
+    if "key" in value:
+        return KEY_STEP_SCHEMA(value)
+    if "navigate" in value:
+        return NAVIGATE_STEP_SCHEMA(value)
+    if "delay" in value:
+        return DELAY_STEP_SCHEMA(value)
+
+    raise vol.Invalid("Sequence step needs one of: key, navigate, delay")
+
+
+SEQUENCE_SCHEMA = vol.All(
+    cv.ensure_list, vol.Length(min=1, max=MAX_SEQUENCE_STEPS), [_validate_step]
+)
+
+
+@dataclass
+class SequenceStep:
+    """A validated step ready to be sent."""
+
+    key_name: str | None = None
+    long_press: bool = False
+    key_repeat: int = 0
+    navigate_path: str | None = None
+    delay: float = 0
+
+
+def compile_sequence(steps: list[dict[str, Any]]) -> list[SequenceStep]:
+    """Turn validated steps into API calls.
+
+    Consecutive presses of the same key are merged into one step.
+    """
+    compiled: list[SequenceStep] = []
+
+    for step in steps:
+        if "delay" in step:
+            compiled.append(SequenceStep(delay=step["delay"]))
+            continue
+
+        if "navigate" in step:
+            compiled.append(SequenceStep(navigate_path=step["navigate"]))
+            continue
+
+        key_name = REMOTE_COMMANDS[step["key"]]
+        previous = compiled[-1] if compiled else None
+
+        if (
+            previous is not None
+            and previous.key_name == key_name
+            and not previous.long_press
+            and not step["long_press"]
+        ):
+            previous.key_repeat += step["repeat"]
+            continue
+
+        compiled.append(
+            SequenceStep(
+                key_name=key_name,
+                long_press=step["long_press"],
+                key_repeat=step["repeat"] - 1,
+            )
+        )
+
+    return compiled
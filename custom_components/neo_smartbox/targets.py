@@ -0,0 +1,153 @@
+"""Service target resolution for NEO Smartbox."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import NeoSmartboxUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _box_device_id(device: dr.DeviceEntry) -> str | None:
+    """Return the NEO device id of a device registry entry."""
+    if device.entry_type is dr.DeviceEntryType.SERVICE:
+        return None
+
+    return next(
+        (identifier for domain, identifier in device.identifiers if domain == DOMAIN),
+        None,
+    )
+
+
+class TargetIndex:
+    """Map Home Assistant device and entity ids to NEO device ids.
+
+    The index is built once from the registries and then kept current
+    from registry update events. It also routes each NEO device to the
+    coordinator of the account it belongs to.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self._device_registry = dr.async_get(hass)
+        self._entity_registry = er.async_get(hass)
+        self._box_by_device: dict[str, str] = {}
+        self._device_by_entity: dict[str, str] = {}
+        self._coordinators: dict[str, NeoSmartboxUpdateCoordinator] = {}
+
+    @callback
+    def async_setup(self) -> None:
+        """Build the index and start listening for registry changes."""
+        for device in self._device_registry.devices.values():
+            if box_device_id := _box_device_id(device):
+                self._box_by_device[device.id] = box_device_id
+
+        for entry in self._entity_registry.entities.values():
+            if entry.platform == DOMAIN and entry.device_id:
+                self._device_by_entity[entry.entity_id] = entry.device_id
+
+        self.hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+        )
+        self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated
+        )
+
+    @callback
+    def _async_device_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Update the index for a changed device."""
+        device_id = event.data["device_id"]
+
+        if event.data["action"] == "remove" or not (
+            device := self._device_registry.async_get(device_id)
+        ):
+            self._box_by_device.pop(device_id, None)
+            return
+
+        if box_device_id := _box_device_id(device):
+            self._box_by_device[device_id] = box_device_id
+        else:
+            self._box_by_device.pop(device_id, None)
+
+    @callback
+    def _async_entity_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Update the index for a changed entity."""
+        entity_id = event.data["entity_id"]
+
+        if old_entity_id := event.data.get("old_entity_id"):
+            self._device_by_entity.pop(old_entity_id, None)
+
+        if event.data["action"] == "remove" or not (
+            entry := self._entity_registry.async_get(entity_id)
+        ):
+            self._device_by_entity.pop(entity_id, None)
+            return
+
+        if entry.platform == DOMAIN and entry.device_id:
+            self._device_by_entity[entity_id] = entry.device_id
+        else:
+            self._device_by_entity.pop(entity_id, None)
+
+    @callback
+    def async_route_devices(
+        self,
+        coordinator: NeoSmartboxUpdateCoordinator,
+        added: Iterable[str],
+        removed: Iterable[str],
+    ) -> None:
+        """Update the devices routed to an account's coordinator."""
+        for box_device_id in removed:
+            if self._coordinators.get(box_device_id) is coordinator:
+                del self._coordinators[box_device_id]
+
+        for box_device_id in added:
+            self._coordinators[box_device_id] = coordinator
+
+    def coordinator(self, box_device_id: str) -> NeoSmartboxUpdateCoordinator | None:
+        """Return the coordinator of the account a NEO device belongs to."""
+        return self._coordinators.get(box_device_id)
+
+    def resolve(self, data: Mapping[str, Any]) -> list[str]:
+        """Return the NEO device ids targeted by service call data."""
+        explicit_device_ids = set(data.get("device_id", []))
+        ha_device_ids: dict[str, None] = dict.fromkeys(data.get("device_id", []))
+
+        for entity_id in data.get("entity_id", []):
+            if ha_device_id := self._device_by_entity.get(entity_id):
+                ha_device_ids[ha_device_id] = None
+            else:
+                _LOGGER.error("Entity not found in entity registry")
+
+        devices = self._device_registry.devices
+
+        for label_id in data.get("label_id", []):
+            for device in devices.get_devices_for_label(label_id):
+                ha_device_ids[device.id] = None
+
+        for area_id in data.get("area_id", []):
+            for device in devices.get_devices_for_area_id(area_id):
+                ha_device_ids[device.id] = None
+
+        box_device_ids: dict[str, None] = {}
+
+        for ha_device_id in ha_device_ids:
+            if box_device_id := self._box_by_device.get(ha_device_id):
+                box_device_ids[box_device_id] = None
+            elif ha_device_id in explicit_device_ids:
+                _LOGGER.error("Device not found in device registry")
+
+        return list(box_device_ids)
@@ -0,0 +1,232 @@
+"""Client side rate limiting and circuit breaking for the NEO API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+import heapq
+import itertools
+import random
+import time
+from typing import Any
+
+import aiohttp
+
+from .const import (
+    API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_OPEN_SECONDS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX_RATE,
+    RATE_LIMIT_MIN_RATE,
+)
+from .scheduler import RequestPriority
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised instead of sending a request while the API is considered down."""
+
+
+def retry_delay(attempt: int) -> float:
+    """Return a jittered exponential backoff delay for a retry attempt."""
+    return random.uniform(
+        0, min(API_RETRY_MAX_DELAY, API_RETRY_BASE_DELAY * 2**attempt)
+    )
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header into seconds."""
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate adapts to throttling by the API.
+
+    The rate is halved whenever the API answers 429 and grows back slowly
+    with every successful request. A Retry-After header pauses all
+    requests until the given time. While requests wait for a token, each
+    new token goes to the waiter with the highest priority.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the rate limiter."""
+        self.rate = RATE_LIMIT_MAX_RATE
+        self._tokens = float(RATE_LIMIT_BURST)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self.throttled_responses = 0
+        self.delayed_requests = 0
+
+    def _token_delay(self) -> float:
+        """Refill the bucket and return the seconds until a token is free."""
+        now = time.monotonic()
+
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        self._tokens = min(
+            float(RATE_LIMIT_BURST),
+            self._tokens + (now - self._updated) * self.rate,
+        )
+        self._updated = now
+
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    async def async_acquire(
+        self, priority: RequestPriority = RequestPriority.POLL
+    ) -> None:
+        """Wait until a request may be sent."""
+        if not self._waiters and self._token_delay() == 0:
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.delayed_requests += 1
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._async_dispatch())
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was handed over just before the cancellation
+                self._tokens += 1
+            raise
+
+    async def _async_dispatch(self) -> None:
+        """Hand out tokens to waiting requests as they become free."""
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+
+            if delay := self._token_delay():
+                await asyncio.sleep(delay)
+                continue
+
+            self._tokens -= 1
+            heapq.heappop(self._waiters)[2].set_result(None)
+
+    def record_throttled(self, retry_after: float | None) -> None:
+        """Slow down after the API answered 429."""
+        self.throttled_responses += 1
+        self.rate = max(RATE_LIMIT_MIN_RATE, self.rate / 2)
+        self._tokens = 0
+
+        if retry_after:
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + retry_after
+            )
+
+    def record_success(self) -> None:
+        """Speed up again after a request went through."""
+        self.rate = min(RATE_LIMIT_MAX_RATE, self.rate + RATE_LIMIT_MIN_RATE)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return rate limiter statistics."""
+        return {
+            "rate": round(self.rate, 2),
+            "waiting": sum(not future.done() for _, _, future in self._waiters),
+            "throttled_responses": self.throttled_responses,
+            "delayed_requests": self.delayed_requests,
+            "blocked_for": round(max(self._blocked_until - time.monotonic(), 0), 1),
+        }
+
+
+class CircuitBreaker:
+    """Fail fast while the API keeps failing.
+
+    After a number of consecutive failures the breaker opens and requests
+    fail immediately. Once the open period is over a single trial request
+    is let through; its outcome closes or reopens the breaker. A trial
+    without an outcome, such as a cancelled or throttled one, frees the
+    way for the next trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected_requests = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if a request may not be sent now."""
+        if self.state == self.CLOSED:
+            return
+
+        if (
+            self.state == self.OPEN
+            and time.monotonic() - self._opened_at >= BREAKER_OPEN_SECONDS
+        ):
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            return
+
+        self.rejected_requests += 1
+        raise CircuitOpenError("NEO API is unavailable, not sending request")
+
+    @contextmanager
+    def attempt(self) -> Iterator[None]:
+        """Check the breaker and hold the trial while a request is sent."""
+        self.check()
+
+        if self.state != self.HALF_OPEN:
+            yield
+            return
+
+        self._trial_in_flight = True
+        try:
+            yield
+        finally:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the breaker if needed."""
+        self.failures += 1
+
+        if self.state == self.HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return circuit breaker state."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected_requests": self.rejected_requests,
+        }
@@ -0,0 +1,235 @@
+"""HTTP transport for the NEO Smartbox cloud API."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    API_BASE_URL,
+    TRANSPORT_CONNECTION_LIMIT,
+    TRANSPORT_DNS_CACHE_TTL,
+    TRANSPORT_KEEPALIVE_TIMEOUT,
+    TRANSPORT_WARM_UP_INTERVAL,
+    TRANSPORT_WARM_UP_WINDOW,
+)
+from .scheduler import RequestPriority, RequestScheduler
+from .throttle import AdaptiveRateLimiter, CircuitBreaker
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NeoSmartboxTransport:
+    """Integration owned HTTP session for the NEO cloud API.
+
+    Connections to the API host are pooled and kept alive. For a while
+    after a key press or other interactive request, a lightweight request
+    keeps one connection warm while idle, so the next key press does not
+    pay for a new TLS handshake. Warm-ups are not counted as requests.
+
+    A single transport is shared by all accounts, together with the
+    scheduler and rate limiter that make up the global request budget.
+    The session is closed when Home Assistant shuts down.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+        self.scheduler = RequestScheduler()
+        self.rate_limiter = AdaptiveRateLimiter()
+        self._session: aiohttp.ClientSession | None = None
+        self._users = 0
+        self._unsub_warm_up: CALLBACK_TYPE | None = None
+        self._breakers: list[CircuitBreaker] = []
+        self._last_request = 0.0
+        self._last_interactive: float | None = None
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_on_close)
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.warm_ups = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the pooled client session."""
+        connector = aiohttp.TCPConnector(
+            limit=TRANSPORT_CONNECTION_LIMIT,
+            limit_per_host=TRANSPORT_CONNECTION_LIMIT,
+            ttl_dns_cache=TRANSPORT_DNS_CACHE_TTL,
+            keepalive_timeout=TRANSPORT_KEEPALIVE_TIMEOUT,
+            ssl=get_default_context(),
+        )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        trace_config.on_request_chunk_sent.append(self._on_request_chunk_sent)
+        trace_config.on_response_chunk_received.append(self._on_response_chunk)
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            auto_decompress=True,
+            trace_configs=[trace_config],
+        )
+
+    async def _on_request_start(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a request and note interactive activity."""
+        if _is_warm_up(context):
+            return
+
+        self.requests += 1
+        self._last_request = time.monotonic()
+
+        if (
+            context.trace_request_ctx
+            and context.trace_request_ctx.get("priority") == RequestPriority.INTERACTIVE
+        ):
+            self._last_interactive = self._last_request
+
+    async def _on_connection_create(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a new connection."""
+        if not _is_warm_up(context):
+            self.connections_created += 1
+
+    async def _on_connection_reuse(
+        self, session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        """Count a reused connection."""
+        if not _is_warm_up(context):
+            self.connections_reused += 1
+
+    async def _on_request_chunk_sent(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestChunkSentParams,
+    ) -> None:
+        """Count request bytes on the metrics passed with the request."""
+        if context.trace_request_ctx and (
+            metrics := context.trace_request_ctx.get("metrics")
+        ):
+            metrics.add_bytes_sent(len(params.chunk))
+
+    async def _on_response_chunk(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceResponseChunkReceivedParams,
+    ) -> None:
+        """Count response bytes on the metrics passed with the request."""
+        if context.trace_request_ctx and (
+            metrics := context.trace_request_ctx.get("metrics")
+        ):
+            metrics.add_bytes_received(len(params.chunk))
+
+    @callback
+    def async_start(self, circuit_breaker: CircuitBreaker) -> CALLBACK_TYPE:
+        """Start using the transport for an account.
+
+        The first account starts keeping connections warm. No warm-up is
+        sent while the circuit breaker of any account is not closed. The
+        returned callback stops using the transport; once no account uses
+        it anymore, the warm-up stops. The session stays open, as an
+        account being reloaded picks it up again right away.
+        """
+        self._users += 1
+        self._breakers.append(circuit_breaker)
+
+        if self._unsub_warm_up is None:
+            self._unsub_warm_up = async_track_time_interval(
+                self.hass,
+                self._async_keep_warm,
+                timedelta(seconds=TRANSPORT_WARM_UP_INTERVAL),
+            )
+
+        @callback
+        def _async_stop() -> None:
+            self._users -= 1
+            self._breakers.remove(circuit_breaker)
+
+            if self._users or self._unsub_warm_up is None:
+                return
+
+            self._unsub_warm_up()
+            self._unsub_warm_up = None
+
+        return _async_stop
+
+    async def _async_keep_warm(self, now: Any = None) -> None:
+        """Warm up a connection after recent interactive activity.
+
+        Nothing is sent if a request went out recently anyway, if the last
+        interactive request is longer than the warm-up window ago, or while
+        the API is failing.
+        """
+        monotonic = time.monotonic()
+
+        if (
+            self._last_interactive is None
+            or monotonic - self._last_interactive > TRANSPORT_WARM_UP_WINDOW
+            or monotonic - self._last_request < TRANSPORT_WARM_UP_INTERVAL
+            or any(breaker.state != CircuitBreaker.CLOSED for breaker in self._breakers)
+        ):
+            return
+
+        await self.async_warm_up()
+
+    async def async_warm_up(self) -> None:
+        """Open or refresh a pooled connection to the API host."""
+        try:
+            async with self.session.head(
+                API_BASE_URL,
+                allow_redirects=False,
+                trace_request_ctx={"warm_up": True},
+            ):
+                pass
+        except aiohttp.ClientError as err:
+            _LOGGER.debug("Unable to warm up connection: %s", err)
+        else:
+            self.warm_ups += 1
+
+    async def _async_on_close(self, event: Event) -> None:
+        """Close the session when Home Assistant shuts down."""
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the session and its connections."""
+        if (session := self._session) is not None:
+            self._session = None
+            await session.close()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return connection reuse statistics."""
+        return {
+            "accounts": self._users,
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "warm_ups": self.warm_ups,
+        }
+
+
+def _is_warm_up(context: SimpleNamespace) -> bool:
+    """Return if a traced request is a connection warm-up."""
+    return bool(context.trace_request_ctx and context.trace_request_ctx.get("warm_up"))
@@ -0,0 +1,79 @@
+"""Websocket commands for the NEO Smartbox remote card."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.auth.permissions.const import POLICY_CONTROL
+from homeassistant.components import websocket_api
+from homeassistant.components.remote import DOMAIN as REMOTE_DOMAIN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import Unauthorized
+from homeassistant.helpers import entity_registry as er
+
+from .const import DATA_TARGET_INDEX, DOMAIN, REMOTE_COMMANDS
+from .scheduler import RequestPriority
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_press)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/press",
+        vol.Required("device_id"): str,
+        vol.Required("key"): vol.In(REMOTE_COMMANDS),
+        vol.Optional("long_press", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_press(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send a key press straight to the device's command queue.
+
+    The user needs control permission on the device's remote entity.
+    """
+    entity_id = er.async_get(hass).async_get_entity_id(
+        REMOTE_DOMAIN, DOMAIN, f"{DOMAIN}_{msg['device_id']}"
+    )
+
+    if not entity_id or not (
+        coordinator := hass.data[DATA_TARGET_INDEX].coordinator(msg["device_id"])
+    ):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Device not found"
+        )
+        return
+
+    if not connection.user.permissions.check_entity(entity_id, POLICY_CONTROL):
+        raise Unauthorized(entity_id=entity_id, permission=POLICY_CONTROL)
+
+    start = time.monotonic()
+
+    try:
+        success = await coordinator.async_send_key(
+            device_id=msg["device_id"],
+            key_name=REMOTE_COMMANDS[msg["key"]],
+            long_press=msg["long_press"],
+            priority=RequestPriority.INTERACTIVE,
+        )
+    except Exception as err:  # noqa: BLE001
+        connection.send_error(msg["id"], websocket_api.ERR_UNKNOWN_ERROR, str(err))
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "success": success,
+            "latency_ms": round((time.monotonic() - start) * 1000, 1),
+        },
+    )
@@ -0,0 +1 @@
+"""Tests for the NEO Smartbox integration."""
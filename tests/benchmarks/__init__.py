@@ -0,0 +1 @@
+"""Benchmarks for the NEO Smartbox integration."""
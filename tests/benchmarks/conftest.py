@@ -0,0 +1,51 @@
+"""Fixtures for NEO Smartbox benchmarks."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Generator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+Runner = Callable[..., Any]
+
+
+@pytest.fixture(autouse=True)
+def unthrottled() -> Generator[None]:
+    """Lift the client side rate limit so it does not dominate the timings."""
+    with (
+        patch("custom_components.neo_smartbox.throttle.RATE_LIMIT_MAX_RATE", 1e6),
+        patch("custom_components.neo_smartbox.throttle.RATE_LIMIT_BURST", 1e6),
+    ):
+        yield
+
+
+@pytest.fixture
+def run(hass: HomeAssistant) -> Runner:
+    """Return a function running a coroutine function to completion.
+
+    Benchmarks are synchronous tests, so the event loop of the test is idle
+    while the benchmark calls this.
+    """
+
+    def _run(target: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        return hass.loop.run_until_complete(target(*args))
+
+    return _run
+
+
+async def async_setup_account(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Set up an account and wait until it has settled."""
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def async_unload_account(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Unload an account."""
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,47 @@
+"""Benchmarks of the NEO Smartbox API client."""
+
+from __future__ import annotations
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.neo_smartbox.models import NeoSmartboxApiClient
+
+from ..fake_api import FakeNeoApi
+from .conftest import Runner
+
+
+@pytest.mark.parametrize("device_count", [1, 50, 500])
+def test_get_all_devices(
+    hass: HomeAssistant,
+    fake_api: FakeNeoApi,
+    api_client: NeoSmartboxApiClient,
+    benchmark: BenchmarkFixture,
+    run: Runner,
+    device_count: int,
+) -> None:
+    """Benchmark a device list poll."""
+    fake_api.stb_count = device_count
+
+    devices = benchmark(run, api_client.get_all_devices)
+
+    assert len(devices) == device_count + fake_api.tv_count
+
+
+@pytest.mark.parametrize("channel_count", [100, 1000])
+def test_get_channel_list(
+    hass: HomeAssistant,
+    fake_api: FakeNeoApi,
+    api_client: NeoSmartboxApiClient,
+    benchmark: BenchmarkFixture,
+    run: Runner,
+    channel_count: int,
+) -> None:
+    """Benchmark fetching and parsing the channel line-up."""
+    fake_api.channel_count = channel_count
+
+    channels = benchmark(run, api_client.get_channel_list)
+
+    assert len(channels) == channel_count
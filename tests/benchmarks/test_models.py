@@ -0,0 +1,105 @@
+"""Memory benchmarks of the NEO Smartbox models."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gc
+import json
+import tracemalloc
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from homeassistant.util.json import json_loads
+
+from custom_components.neo_smartbox.models import TvChannel
+
+from ..fake_api import CHANNEL_GROUPS
+
+
+@dataclass
+class PlainTvChannel:
+    """TV channel as it was modelled before the models were slotted."""
+
+    id: str
+    title: str
+    number: str
+    logo: str
+    favorite: bool
+    group: str
+
+
+def _parse_plain(data: dict[str, Any]) -> list[PlainTvChannel]:
+    """Parse a line-up the way it was parsed before."""
+    return [
+        PlainTvChannel(
+            id=item["channel"]["id"],
+            title=item["channel"]["title"],
+            number=item["channel"]["number"],
+            logo=item["channel"]["logo"],
+            favorite=item["channel"]["favorite"],
+            group=item["channel"]["group"],
+        )
+        for item in data.get("data", [])
+    ]
+
+
+def _parse(data: dict[str, Any]) -> list[TvChannel]:
+    """Parse a line-up the way the API client does."""
+    return [TvChannel.from_dict(item["channel"]) for item in data.get("data", [])]
+
+
+def _zap_list(channel_count: int) -> bytes:
+    """Return a ZapList response body."""
+    return json.dumps(
+        {
+            "data": [
+                {
+                    "channel": {
+                        "id": f"ch-{index}",
+                        "title": f"Channel {index}",
+                        "number": str(index + 1),
+                        "logo": f"https://example.com/logos/ch-{index}.png",
+                        "favorite": index % 10 == 0,
+                        "group": CHANNEL_GROUPS[index % len(CHANNEL_GROUPS)],
+                    }
+                }
+                for index in range(channel_count)
+            ]
+        }
+    ).encode()
+
+
+def _retained(parse: Any, body: bytes) -> int:
+    """Return the bytes still held by the models once the response is freed."""
+    # Warm up, so one-off allocations of the first parse are not counted
+    parse(json_loads(body))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        channels = parse(json_loads(body))
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert channels
+    return retained
+
+
+@pytest.mark.parametrize("channel_count", [1_000, 10_000])
+def test_channel_memory(benchmark: BenchmarkFixture, channel_count: int) -> None:
+    """Compare the memory held by a line-up before and after slotting."""
+    body = _zap_list(channel_count)
+
+    before = _retained(_parse_plain, body)
+    after = _retained(_parse, body)
+
+    benchmark.extra_info["bytes_before"] = before
+    benchmark.extra_info["bytes_after"] = after
+    benchmark.extra_info["bytes_per_channel_before"] = before // channel_count
+    benchmark.extra_info["bytes_per_channel_after"] = after // channel_count
+
+    channels = benchmark(_parse, json_loads(body))
+
+    assert len(channels) == channel_count
+    assert after < 0.85 * before
@@ -0,0 +1,84 @@
+"""Benchmarks of NEO Smartbox services."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.neo_smartbox import REMOTE_KEY_ACTION, get_devices_from_target
+from custom_components.neo_smartbox.const import DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from ..fake_api import FakeNeoApi
+from .conftest import Runner, async_setup_account, async_unload_account
+
+DEVICE_COUNTS = [1, 50, 500]
+
+
+def _target(hass: HomeAssistant, entry: MockConfigEntry) -> dict[str, Any]:
+    """Return service call data targeting every device of the account."""
+    device_registry = dr.async_get(hass)
+    return {
+        "device_id": [
+            device.id
+            for device in dr.async_entries_for_config_entry(
+                device_registry, entry.entry_id
+            )
+        ]
+    }
+
+
+@pytest.mark.parametrize("device_count", DEVICE_COUNTS)
+def test_remote_key_action_fan_out(
+    hass: HomeAssistant,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+    benchmark: BenchmarkFixture,
+    run: Runner,
+    device_count: int,
+) -> None:
+    """Benchmark a key press sent to every device of an account."""
+    fake_api.stb_count = device_count
+    fake_api.tv_count = 0
+    run(async_setup_account, hass, config_entry)
+    data = {"action": "ok", **_target(hass, config_entry)}
+
+    async def _press() -> dict[str, Any]:
+        return await hass.services.async_call(
+            DOMAIN, REMOTE_KEY_ACTION, data, blocking=True, return_response=True
+        )
+
+    response = benchmark.pedantic(run, args=(_press,), rounds=5, warmup_rounds=1)
+
+    assert len(response["results"]) == device_count
+    assert all(result["success"] for result in response["results"].values())
+
+    run(async_unload_account, hass, config_entry)
+
+
+@pytest.mark.parametrize("device_count", DEVICE_COUNTS)
+def test_get_devices_from_target(
+    hass: HomeAssistant,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+    benchmark: BenchmarkFixture,
+    run: Runner,
+    device_count: int,
+) -> None:
+    """Benchmark resolving a service target to NEO devices."""
+    fake_api.stb_count = device_count
+    fake_api.tv_count = 0
+    run(async_setup_account, hass, config_entry)
+    data = _target(hass, config_entry)
+
+    box_device_ids = benchmark(get_devices_from_target, hass, data)
+
+    assert sorted(box_device_ids) == sorted(fake_api.device_ids)
+
+    run(async_unload_account, hass, config_entry)
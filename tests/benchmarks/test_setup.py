@@ -0,0 +1,45 @@
+"""Benchmarks of NEO Smartbox setup."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.neo_smartbox.const import DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from ..fake_api import FakeNeoApi
+from .conftest import Runner, async_setup_account, async_unload_account
+
+
+@pytest.mark.parametrize("device_count", [1, 50, 500])
+def test_entry_setup(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+    benchmark: BenchmarkFixture,
+    run: Runner,
+    device_count: int,
+) -> None:
+    """Benchmark setting up an account without a cached device list."""
+    fake_api.stb_count = device_count
+    fake_api.tv_count = 0
+
+    def _forget_cache() -> None:
+        hass_storage.pop(f"{DOMAIN}.{config_entry.entry_id}", None)
+
+    def _setup_and_unload() -> int:
+        run(async_setup_account, hass, config_entry)
+        remotes = len(hass.states.async_entity_ids("remote"))
+        run(async_unload_account, hass, config_entry)
+        return remotes
+
+    remotes = benchmark.pedantic(_setup_and_unload, setup=_forget_cache, rounds=3)
+
+    assert remotes == device_count
@@ -0,0 +1,95 @@
+"""Startup timing of the NEO Smartbox frontend."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.neo_smartbox import frontend
+
+RESOURCE_LOAD_DELAY = 0.3
+
+
+class SlowResources:
+    """Lovelace resource collection whose store takes a while to load."""
+
+    def __init__(self) -> None:
+        """Initialize the collection."""
+        self.loaded = False
+        self.loads = 0
+        self.items: list[dict[str, Any]] = []
+
+    async def async_load(self) -> None:
+        """Load the resources."""
+        self.loads += 1
+        await asyncio.sleep(RESOURCE_LOAD_DELAY)
+
+    def async_items(self) -> list[dict[str, Any]]:
+        """Return the resources."""
+        return self.items
+
+    async def async_create_item(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Add a resource."""
+        item = {"id": str(len(self.items)), **data}
+        self.items.append(item)
+        return item
+
+    async def async_update_item(
+        self, item_id: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Update a resource."""
+        item = next(item for item in self.items if item["id"] == item_id)
+        item.update(data)
+        return item
+
+
+async def test_resource_registration_off_startup_path(hass: HomeAssistant) -> None:
+    """Test setup does not wait for the Lovelace resource store."""
+    assert await async_setup_component(hass, "http", {})
+    resources = SlowResources()
+    hass.data[frontend.LOVELACE_DOMAIN] = SimpleNamespace(resources=resources)
+    hass.set_state(CoreState.starting)
+
+    start = time.monotonic()
+    assert await frontend.async_setup(hass)
+    setup_time = time.monotonic() - start
+
+    assert resources.loads == 0
+
+    start = time.monotonic()
+    hass.set_state(CoreState.running)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    registration_time = time.monotonic() - start
+
+    assert resources.loads == 1
+    assert [item["url"] for item in resources.items] == [
+        frontend._load_card(frontend.CARD_PATH).url
+    ]
+    # Before, setup also waited for the resource store
+    assert registration_time >= RESOURCE_LOAD_DELAY
+    assert setup_time < registration_time / 2
+
+
+async def test_registered_resource_remembered(hass: HomeAssistant) -> None:
+    """Test a later boot skips the resource store if the card is unchanged."""
+    resources = SlowResources()
+    hass.data[frontend.LOVELACE_DOMAIN] = SimpleNamespace(resources=resources)
+    card_url = frontend._load_card(frontend.CARD_PATH).url
+
+    await frontend._async_register_resource(hass, card_url)
+    resources.loaded = False
+
+    start = time.monotonic()
+    await frontend._async_register_resource(hass, card_url)
+    elapsed = time.monotonic() - start
+
+    assert resources.loads == 1
+    assert len(resources.items) == 1
+    assert elapsed < RESOURCE_LOAD_DELAY
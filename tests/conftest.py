@@ -0,0 +1,50 @@
+"""Fixtures for NEO Smartbox tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import aiohttp
+import pytest
+
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from custom_components.neo_smartbox.const import DOMAIN
+from custom_components.neo_smartbox.models import NeoSmartboxApiClient
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .fake_api import API_KEY, FakeNeoApi
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the integration in all tests."""
+
+
+@pytest.fixture
+async def fake_api(socket_enabled: None) -> AsyncGenerator[FakeNeoApi]:
+    """Serve a fake NEO cloud API and point the integration at it."""
+    async with FakeNeoApi().serve() as api:
+        yield api
+
+
+@pytest.fixture
+async def api_client(fake_api: FakeNeoApi) -> AsyncGenerator[NeoSmartboxApiClient]:
+    """Return an API client talking to the fake API."""
+    async with aiohttp.ClientSession() as session:
+        yield NeoSmartboxApiClient(API_KEY, session)
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return a config entry for the fake account."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="NEO Smartbox",
+        unique_id=API_KEY,
+        data={CONF_API_KEY: API_KEY},
+    )
+    entry.add_to_hass(hass)
+    return entry
@@ -0,0 +1,212 @@
+"""Local stand-in for the NEO cloud API.
+
+Serves the CompanionService, SelfCareService and WebEpg endpoints the
+integration uses, with configurable latency, error rate and account size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import ExitStack, asynccontextmanager
+from http import HTTPStatus
+import random
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+API_KEY = "test-api-key"
+
+DEVICE_LIST = "titan.tv.CompanionService/DeviceList"
+SMART_TV_LIST = "titan.management.SelfCareService/GetSmartTVList"
+SEND_KEY_ACTION = "titan.tv.CompanionService/SendKeyAction"
+NAVIGATE_ACTION = "titan.tv.CompanionService/NavigateAction"
+ZAP_LIST = "titan.tv.WebEpg/ZapList"
+
+# Module level URL constants that are pointed at the fake server
+_URL_TARGETS = {
+    "models.API_DEVICE_LIST": DEVICE_LIST,
+    "models.API_GET_SMART_TV_LIST": SMART_TV_LIST,
+    "models.API_SEND_KEY_ACTION": SEND_KEY_ACTION,
+    "models.API_NAVIGATE_ACTION": NAVIGATE_ACTION,
+    "models.API_ZAP_LIST": ZAP_LIST,
+    "transport.API_BASE_URL": "",
+}
+
+CHANNEL_GROUPS = ("General", "News", "Sports", "Movies", "Kids", "Music")
+
+# A 1x1 transparent PNG served as every channel logo
+LOGO = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc33000000"
+    "0049454e44ae426082"
+)
+
+
+class FakeNeoApi:
+    """A fake NEO cloud API on a local aiohttp server.
+
+    Every request waits for `latency` seconds (or the latency of its
+    endpoint) and fails with a 503 at the given error rate. Endpoints in
+    `failing` always fail with their status code.
+    """
+
+    def __init__(
+        self,
+        stb_count: int = 2,
+        tv_count: int = 1,
+        channel_count: int = 20,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the fake API."""
+        self.stb_count = stb_count
+        self.tv_count = tv_count
+        self.channel_count = channel_count
+        self.latency = latency
+        self.endpoint_latency: dict[str, float] = {}
+        self.error_rate = error_rate
+        self.failing: dict[str, HTTPStatus] = {}
+        self.requests: Counter[str] = Counter()
+        self.key_actions: list[dict[str, Any]] = []
+        self.navigate_actions: list[dict[str, Any]] = []
+        self._random = random.Random(seed)
+        self._server: TestServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL the API is served at."""
+        assert self._server is not None
+        return str(self._server.make_url("/api"))
+
+    @property
+    def device_ids(self) -> list[str]:
+        """Return the ids of all devices of the account."""
+        return [f"stb-{index}" for index in range(self.stb_count)] + [
+            f"tv-{index}" for index in range(self.tv_count)
+        ]
+
+    def channels(self) -> list[dict[str, Any]]:
+        """Return the channel line-up in its API form."""
+        return [
+            {
+                "id": f"ch-{index}",
+                "title": f"Channel {index}",
+                "number": str(index + 1),
+                "logo": f"{self.base_url}/logos/ch-{index}.png",
+                "favorite": index % 10 == 0,
+                "group": CHANNEL_GROUPS[index % len(CHANNEL_GROUPS)],
+            }
+            for index in range(self.channel_count)
+        ]
+
+    @asynccontextmanager
+    async def serve(self) -> AsyncIterator[FakeNeoApi]:
+        """Serve the API and point the integration at it."""
+        app = web.Application()
+        app.router.add_route("HEAD", "/api", self._handle_ping)
+        app.router.add_post(f"/api/{DEVICE_LIST}", self._handle_device_list)
+        app.router.add_get(f"/api/{SMART_TV_LIST}", self._handle_smart_tv_list)
+        app.router.add_post(f"/api/{SEND_KEY_ACTION}", self._handle_key_action)
+        app.router.add_post(f"/api/{NAVIGATE_ACTION}", self._handle_navigate_action)
+        app.router.add_get(f"/api/{ZAP_LIST}", self._handle_zap_list)
+        app.router.add_get("/api/logos/{channel_id}.png", self._handle_logo)
+
+        self._server = TestServer(app, host="127.0.0.1")
+        await self._server.start_server()
+
+        try:
+            with ExitStack() as stack:
+                for target, path in _URL_TARGETS.items():
+                    url = f"{self.base_url}/{path}" if path else self.base_url
+                    stack.enter_context(
+                        patch(f"custom_components.neo_smartbox.{target}", url)
+                    )
+                yield self
+        finally:
+            await self._server.close()
+            self._server = None
+
+    async def _respond(
+        self, request: web.Request, endpoint: str, data: Any = None
+    ) -> web.Response:
+        """Answer a request after the configured latency and errors."""
+        self.requests[endpoint] += 1
+
+        if latency := self.endpoint_latency.get(endpoint, self.latency):
+            await asyncio.sleep(latency)
+
+        if request.headers.get("authorization") != f"APIGW-AUTH-TOK {API_KEY}":
+            return web.json_response({}, status=HTTPStatus.FORBIDDEN)
+
+        if (status := self.failing.get(endpoint)) is not None:
+            return web.json_response({}, status=status)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.json_response({}, status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+        return web.json_response({} if data is None else data)
+
+    async def _handle_ping(self, request: web.Request) -> web.Response:
+        """Answer the connection warm-up."""
+        self.requests["ping"] += 1
+        return web.Response()
+
+    async def _handle_device_list(self, request: web.Request) -> web.Response:
+        """Return the set-top boxes."""
+        return await self._respond(
+            request,
+            DEVICE_LIST,
+            {
+                "items": [
+                    {"device_id": f"stb-{index}", "name": f"Smartbox {index}"}
+                    for index in range(self.stb_count)
+                ]
+            },
+        )
+
+    async def _handle_smart_tv_list(self, request: web.Request) -> web.Response:
+        """Return the smart TVs."""
+        return await self._respond(
+            request,
+            SMART_TV_LIST,
+            {
+                "devices": [
+                    {"uuid": f"tv-{index}", "device_name": f"Smart TV {index}"}
+                    for index in range(self.tv_count)
+                ]
+            },
+        )
+
+    async def _handle_key_action(self, request: web.Request) -> web.Response:
+        """Record a key press."""
+        payload = await request.json()
+        if payload["device_id"] not in self.device_ids:
+            return web.json_response({}, status=HTTPStatus.NOT_FOUND)
+        self.key_actions.append(payload)
+        return await self._respond(request, SEND_KEY_ACTION)
+
+    async def _handle_navigate_action(self, request: web.Request) -> web.Response:
+        """Record a navigation."""
+        payload = await request.json()
+        if payload["device_id"] not in self.device_ids:
+            return web.json_response({}, status=HTTPStatus.NOT_FOUND)
+        self.navigate_actions.append(payload)
+        return await self._respond(request, NAVIGATE_ACTION)
+
+    async def _handle_zap_list(self, request: web.Request) -> web.Response:
+        """Return the channel line-up."""
+        return await self._respond(
+            request,
+            ZAP_LIST,
+            {"data": [{"channel": channel} for channel in self.channels()]},
+        )
+
+    async def _handle_logo(self, request: web.Request) -> web.Response:
+        """Return a channel logo."""
+        self.requests["logo"] += 1
+        return web.Response(body=LOGO, content_type="image/png")
@@ -0,0 +1,91 @@
+"""Tests for the NEO Smartbox channel index."""
+
+from __future__ import annotations
+
+from custom_components.neo_smartbox.channels import ChannelIndex, normalize_title
+from custom_components.neo_smartbox.models import TvChannel
+
+
+def _channel(
+    channel_id: str, title: str, number: str, group: str = "General"
+) -> TvChannel:
+    """Return a channel."""
+    return TvChannel(
+        id=channel_id,
+        title=title,
+        number=number,
+        logo="",
+        favorite=False,
+        group=group,
+    )
+
+
+CHANNELS = [
+    _channel("1", "SLO 1", "1"),
+    _channel("2", "SLO 2", "2"),
+    _channel("3", "Pop TV", "3"),
+    _channel("4", "Eurosport 1 HD", "20", "Sports"),
+    _channel("5", "Čarli", "30", "Kids"),
+]
+
+
+def test_normalize_title() -> None:
+    """Test titles are compared without case, accents and punctuation."""
+    assert normalize_title("Čarli TV-HD!") == "carlitvhd"
+
+
+def test_resolve() -> None:
+    """Test channels are resolved by id, number and name."""
+    index = ChannelIndex()
+    index.update(CHANNELS)
+
+    assert len(index) == 5
+    assert index.resolve(channel_id="3").title == "Pop TV"
+    assert index.resolve(number=20).title == "Eurosport 1 HD"
+    assert index.resolve(number=" 2 ").title == "SLO 2"
+    assert index.resolve(name="pop tv").id == "3"
+    assert index.resolve(name="carli").id == "5"
+    assert index.resolve(name="eurosport").id == "4"
+    assert index.resolve(name="pop tw").id == "3"
+    assert index.resolve(name="nothing like it") is None
+    assert index.resolve() is None
+
+
+def test_id_wins_over_number_and_name() -> None:
+    """Test an id is used even if a number or name is given too."""
+    index = ChannelIndex()
+    index.update(CHANNELS)
+
+    assert index.resolve(channel_id="1", number="2", name="Pop TV").id == "1"
+    assert index.resolve(channel_id="missing", number="2") is None
+
+
+def test_groups() -> None:
+    """Test channels are grouped."""
+    index = ChannelIndex()
+    index.update(CHANNELS)
+
+    assert sorted(index.groups) == ["General", "Kids", "Sports"]
+    assert [channel.id for channel in index.get_group("General")] == ["1", "2", "3"]
+    assert index.get_group("Missing") == []
+
+
+def test_update() -> None:
+    """Test an update adds, changes and removes only what changed."""
+    index = ChannelIndex()
+    index.update(CHANNELS)
+
+    index.update(
+        [
+            CHANNELS[0],
+            _channel("2", "SLO 2 HD", "2"),
+            _channel("6", "Kanal A", "4"),
+            *CHANNELS[3:],
+        ]
+    )
+
+    assert len(index) == 5
+    assert index.resolve(channel_id="3") is None
+    assert index.resolve(number=2).title == "SLO 2 HD"
+    assert index.resolve(name="kanal a").id == "6"
+    assert index.resolve(number=3) is None
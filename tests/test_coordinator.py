@@ -0,0 +1,99 @@
+"""Tests for the NEO Smartbox coordinator."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.neo_smartbox.const import DEVICE_REMOVAL_POLLS, DOMAIN
+from custom_components.neo_smartbox.sequence import SEQUENCE_SCHEMA, compile_sequence
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .fake_api import SEND_KEY_ACTION, SMART_TV_LIST, FakeNeoApi
+
+SEQUENCE = ["up", "down", "left", "right"]
+
+
+async def test_run_sequence(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test every press of a sequence is sent in order."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    coordinator = config_entry.runtime_data
+
+    assert await coordinator.async_run_sequence(
+        "stb-0", compile_sequence(SEQUENCE_SCHEMA(SEQUENCE))
+    )
+
+    assert [action["key_name"] for action in fake_api.key_actions] == [
+        "CursorUp",
+        "CursorDown",
+        "CursorLeft",
+        "CursorRight",
+    ]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_run_sequence_stops_after_failed_press(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test the presses queued after a failed press are not sent."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    coordinator = config_entry.runtime_data
+    fake_api.failing[SEND_KEY_ACTION] = HTTPStatus.BAD_REQUEST
+
+    assert not await coordinator.async_run_sequence(
+        "stb-0", compile_sequence(SEQUENCE_SCHEMA(SEQUENCE))
+    )
+    await hass.async_block_till_done()
+
+    assert fake_api.requests[SEND_KEY_ACTION] == 1
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_partial_update_keeps_missing_devices(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test partial device lists never remove or count missing devices."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data
+    device_registry = dr.async_get(hass)
+
+    # stb-1 is missing from one full list
+    fake_api.stb_count = 1
+    await coordinator.async_refresh()
+    assert coordinator.missing_devices == {"stb-1": 1}
+
+    # It is back in a list whose Smart TV half failed
+    fake_api.stb_count = 2
+    fake_api.failing[SMART_TV_LIST] = HTTPStatus.BAD_REQUEST
+    await coordinator.async_refresh()
+    assert coordinator.missing_devices == {}
+    assert coordinator.is_available("stb-1")
+
+    # Missing again, but only from partial lists
+    fake_api.stb_count = 1
+    for _ in range(DEVICE_REMOVAL_POLLS + 1):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.missing_devices == {}
+    assert set(coordinator.devices) == set(fake_api.device_ids) | {"stb-1"}
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "stb-1")})
+
+    # Full lists count the misses and finally remove it
+    del fake_api.failing[SMART_TV_LIST]
+    for _ in range(DEVICE_REMOVAL_POLLS):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert "stb-1" not in coordinator.devices
+    assert not device_registry.async_get_device(identifiers={(DOMAIN, "stb-1")})
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
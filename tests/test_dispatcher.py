@@ -0,0 +1,177 @@
+"""Tests for NEO Smartbox command dispatching."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.neo_smartbox.dispatcher import DeviceCommandQueue, async_fan_out
+from custom_components.neo_smartbox.scheduler import RequestPriority
+
+
+async def _until(condition: Callable[[], bool]) -> None:
+    """Let the event loop run until a condition holds."""
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("Condition not reached")
+
+
+async def test_fan_out_limit() -> None:
+    """Test fan-out bounds concurrency and returns a result per device."""
+    active = peak = 0
+
+    async def _send(box_device_id: str) -> bool:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return box_device_id != "b"
+
+    results = await async_fan_out(["a", "b", "c", "a", None, "d"], _send, limit=2)
+
+    assert peak == 2
+    assert list(results) == ["a", "b", "c", "d"]
+    assert results["a"] == {"success": True, "error": None}
+    assert results["b"] == {"success": False, "error": "request_failed"}
+
+
+async def test_fan_out_error() -> None:
+    """Test a failing device does not hide the others."""
+
+    async def _send(box_device_id: str) -> bool:
+        if box_device_id == "b":
+            raise HomeAssistantError("Device b is offline")
+        return True
+
+    results = await async_fan_out(["a", "b"], _send)
+
+    assert results == {
+        "a": {"success": True, "error": None},
+        "b": {"success": False, "error": "Device b is offline"},
+    }
+
+
+class _Recorder:
+    """Send function that records requests and holds them until released."""
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.sent: list[tuple[str, int]] = []
+        self.release = asyncio.Event()
+
+    async def __call__(
+        self,
+        key_name: str,
+        long_press: bool,
+        key_repeat: int,
+        priority: RequestPriority,
+    ) -> bool:
+        """Record a request and wait until released."""
+        self.sent.append((key_name, key_repeat))
+        await self.release.wait()
+        return True
+
+
+async def test_repeated_presses_coalesced(hass: HomeAssistant) -> None:
+    """Test presses of the same key queued behind a request are merged."""
+    recorder = _Recorder()
+    queue = DeviceCommandQueue(hass, "stb-0", recorder)
+
+    first = asyncio.ensure_future(queue.async_send_key("VolumeUp"))
+    await _until(lambda: len(recorder.sent) == 1)
+
+    repeats = [
+        asyncio.ensure_future(queue.async_send_key("VolumeUp")) for _ in range(3)
+    ]
+    other = asyncio.ensure_future(queue.async_send_key("VolumeDown"))
+    await _until(lambda: queue.depth == 2)
+
+    recorder.release.set()
+
+    assert all(await asyncio.gather(first, *repeats, other))
+    assert recorder.sent == [("VolumeUp", 0), ("VolumeUp", 2), ("VolumeDown", 0)]
+    assert queue.coalesced_count == 2
+
+
+async def test_cancelled_merged_presses_not_sent(hass: HomeAssistant) -> None:
+    """Test merged presses of cancelled callers are left out of the repeat."""
+    recorder = _Recorder()
+    queue = DeviceCommandQueue(hass, "stb-0", recorder)
+
+    first = asyncio.ensure_future(queue.async_send_key("VolumeUp"))
+    await _until(lambda: len(recorder.sent) == 1)
+
+    kept = asyncio.ensure_future(queue.async_send_key("VolumeUp"))
+    cancelled = asyncio.ensure_future(queue.async_send_key("VolumeUp", key_repeat=4))
+    also_kept = asyncio.ensure_future(queue.async_send_key("VolumeUp", key_repeat=1))
+    await _until(lambda: queue.coalesced_count == 2)
+    cancelled.cancel()
+
+    recorder.release.set()
+
+    assert all(await asyncio.gather(first, kept, also_kept))
+    assert recorder.sent == [("VolumeUp", 0), ("VolumeUp", 2)]
+
+
+async def test_long_press_not_coalesced(hass: HomeAssistant) -> None:
+    """Test long presses are sent on their own."""
+    recorder = _Recorder()
+    queue = DeviceCommandQueue(hass, "stb-0", recorder)
+
+    first = asyncio.ensure_future(queue.async_send_key("Select"))
+    await _until(lambda: len(recorder.sent) == 1)
+
+    presses = [
+        asyncio.ensure_future(queue.async_send_key("Select", long_press=True)),
+        asyncio.ensure_future(queue.async_send_key("Select")),
+    ]
+    await _until(lambda: queue.depth == 2)
+
+    recorder.release.set()
+    await asyncio.gather(first, *presses)
+
+    assert recorder.sent == [("Select", 0), ("Select", 0), ("Select", 0)]
+    assert queue.coalesced_count == 0
+
+
+async def test_cancelled_press_not_sent(hass: HomeAssistant) -> None:
+    """Test a press nobody waits for anymore is skipped."""
+    recorder = _Recorder()
+    queue = DeviceCommandQueue(hass, "stb-0", recorder)
+
+    first = asyncio.ensure_future(queue.async_send_key("CursorUp"))
+    await _until(lambda: len(recorder.sent) == 1)
+
+    cancelled = asyncio.ensure_future(queue.async_send_key("CursorDown"))
+    await _until(lambda: queue.depth == 1)
+    cancelled.cancel()
+
+    recorder.release.set()
+    assert await first
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert recorder.sent == [("CursorUp", 0)]
+
+
+async def test_shutdown_cancels_waiting_presses(hass: HomeAssistant) -> None:
+    """Test shutting the queue down cancels queued presses."""
+    recorder = _Recorder()
+    queue = DeviceCommandQueue(hass, "stb-0", recorder)
+
+    first = asyncio.ensure_future(queue.async_send_key("CursorUp"))
+    await _until(lambda: len(recorder.sent) == 1)
+    waiting = asyncio.ensure_future(queue.async_send_key("CursorDown"))
+    await _until(lambda: queue.depth == 1)
+
+    queue.async_shutdown()
+    await asyncio.gather(first, waiting, return_exceptions=True)
+
+    assert first.cancelled()
+    assert waiting.cancelled()
+    assert queue.depth == 0
@@ -0,0 +1,134 @@
+"""Tests for NEO Smartbox device health tracking."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+from aiohttp import ClientResponseError
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.remote import (
+    ATTR_COMMAND,
+    DOMAIN as REMOTE_DOMAIN,
+    SERVICE_SEND_COMMAND,
+)
+from homeassistant.const import ATTR_ENTITY_ID, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.neo_smartbox.const import (
+    DOMAIN,
+    HEALTH_OFFLINE_FAILURES,
+    HEALTH_PROBE_INTERVAL,
+)
+from custom_components.neo_smartbox.health import DeviceHealth, DeviceOfflineError
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .fake_api import SEND_KEY_ACTION, FakeNeoApi
+
+
+async def test_offline_after_failures(hass: HomeAssistant) -> None:
+    """Test a device goes offline after failures in a row and then fails fast."""
+    health = DeviceHealth(hass, "stb-0")
+
+    health.async_record(False)
+    health.async_record(True)
+    for _ in range(HEALTH_OFFLINE_FAILURES - 1):
+        health.async_record(False)
+    assert health.available
+
+    health.async_record(False)
+    assert not health.available
+
+    with pytest.raises(DeviceOfflineError):
+        await health.async_check()
+    assert health.rejected == 1
+
+
+async def test_probe_brings_device_back(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test one probe is let through per interval and a success recovers."""
+    health = DeviceHealth(hass, "stb-0")
+
+    for _ in range(HEALTH_OFFLINE_FAILURES):
+        health.async_record(False)
+
+    with pytest.raises(DeviceOfflineError):
+        await health.async_check()
+
+    freezer.tick(HEALTH_PROBE_INTERVAL)
+
+    # The probe is due, so one command goes through
+    await health.async_check()
+    with pytest.raises(DeviceOfflineError):
+        await health.async_check()
+
+    health.async_record(True)
+    assert health.available
+    await health.async_check()
+
+
+async def test_score(hass: HomeAssistant) -> None:
+    """Test the score is the share of recent successes."""
+    health = DeviceHealth(hass, "stb-0")
+    assert health.score == 100
+
+    for success in (True, True, True, False):
+        health.async_record(success)
+
+    assert health.score == 75
+
+
+async def test_remote_unavailable_while_offline(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test the remote of a box rejecting presses goes unavailable."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        REMOTE_DOMAIN, DOMAIN, f"{DOMAIN}_stb-0"
+    )
+    fake_api.failing[SEND_KEY_ACTION] = HTTPStatus.BAD_REQUEST
+
+    for _ in range(HEALTH_OFFLINE_FAILURES):
+        await hass.services.async_call(
+            REMOTE_DOMAIN,
+            SERVICE_SEND_COMMAND,
+            {ATTR_ENTITY_ID: entity_id, ATTR_COMMAND: "ok"},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+    assert fake_api.requests[SEND_KEY_ACTION] == HEALTH_OFFLINE_FAILURES
+
+    with pytest.raises(DeviceOfflineError):
+        await hass.data[DOMAIN][config_entry.entry_id].async_send_key("stb-0", "OK")
+    assert fake_api.requests[SEND_KEY_ACTION] == HEALTH_OFFLINE_FAILURES
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_server_errors_not_counted(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test throttling and server errors do not mark a box offline."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    for status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE):
+        fake_api.failing[SEND_KEY_ACTION] = status
+        for _ in range(HEALTH_OFFLINE_FAILURES):
+            with pytest.raises(ClientResponseError):
+                await coordinator.async_send_key("stb-0", "OK")
+
+    assert coordinator.is_available("stb-0")
+    assert coordinator.health["stb-0"].score == 100
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
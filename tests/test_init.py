@@ -0,0 +1,60 @@
+"""Tests for the NEO Smartbox integration setup."""
+
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.neo_smartbox.const import DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .fake_api import FakeNeoApi
+
+
+async def test_setup_and_unload(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test the entry sets up a remote for every device and unloads."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert len(hass.states.async_entity_ids("remote")) == len(fake_api.device_ids)
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+@pytest.mark.parametrize(
+    "sequence", [[], ["not_a_key"], [{"key": "ok", "repeat": 0}], [{"wait": 1}]]
+)
+async def test_run_sequence_invalid(
+    hass: HomeAssistant,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+    sequence: list,
+) -> None:
+    """Test an invalid sequence fails the service call without sending."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "stb-0")})
+
+    with pytest.raises(ServiceValidationError, match="Invalid sequence"):
+        await hass.services.async_call(
+            DOMAIN,
+            "run_sequence",
+            {"device_id": device.id, "sequence": sequence},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert fake_api.key_actions == []
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,121 @@
+"""Tests for the NEO Smartbox channel logo cache."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.neo_smartbox.const import DATA_LOGO_CACHE, DOMAIN
+from custom_components.neo_smartbox.logos import LogoCache, logo_url
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from .fake_api import LOGO, FakeNeoApi
+
+
+async def test_logo_downloaded_once(hass: HomeAssistant, fake_api: FakeNeoApi) -> None:
+    """Test a logo is downloaded once and then served from disk."""
+    cache = LogoCache(hass)
+    await cache.async_load()
+    url = f"{fake_api.base_url}/logos/ch-0.png"
+
+    for _ in range(3):
+        body, entry = await cache.async_get("ch-0", url)
+        assert body == LOGO
+        assert entry["content_type"] == "image/png"
+
+    assert fake_api.requests["logo"] == 1
+    diagnostics = cache.diagnostics()
+    assert diagnostics["hits"] == 3
+    assert diagnostics["downloads"] == 1
+    assert diagnostics["bytes"] == len(LOGO)
+
+
+async def test_least_recently_used_evicted(
+    hass: HomeAssistant, fake_api: FakeNeoApi
+) -> None:
+    """Test the least recently used logo is evicted over the size limit."""
+    cache = LogoCache(hass)
+    await cache.async_load()
+
+    def url(channel_id: str) -> str:
+        return f"{fake_api.base_url}/logos/{channel_id}.png"
+
+    with patch(
+        "custom_components.neo_smartbox.logos.LOGO_CACHE_MAX_BYTES", 2 * len(LOGO)
+    ):
+        await cache.async_get("ch-0", url("ch-0"))
+        await cache.async_get("ch-1", url("ch-1"))
+        await cache.async_get("ch-0", url("ch-0"))
+        await cache.async_get("ch-2", url("ch-2"))
+
+        assert fake_api.requests["logo"] == 3
+        assert cache.diagnostics()["logos"] == 2
+
+        # ch-0 was used after ch-1, so ch-1 went and ch-0 is still on disk
+        await cache.async_get("ch-0", url("ch-0"))
+        assert fake_api.requests["logo"] == 3
+        await cache.async_get("ch-1", url("ch-1"))
+        assert fake_api.requests["logo"] == 4
+
+
+async def test_refreshed_logo_not_evicted_first(
+    hass: HomeAssistant, fake_api: FakeNeoApi
+) -> None:
+    """Test a logo downloaded again counts as the most recently used."""
+    cache = LogoCache(hass)
+    await cache.async_load()
+
+    def url(channel_id: str) -> str:
+        return f"{fake_api.base_url}/logos/{channel_id}.png"
+
+    with patch(
+        "custom_components.neo_smartbox.logos.LOGO_CACHE_MAX_BYTES", 2 * len(LOGO)
+    ):
+        await cache.async_get("ch-0", url("ch-0"))
+        await cache.async_get("ch-1", url("ch-1"))
+        # The channel got a new logo, which prefetching downloads
+        await cache.async_ensure("ch-0", f"{url('ch-0')}?v=2")
+        await cache.async_get("ch-2", url("ch-2"))
+
+        assert fake_api.requests["logo"] == 4
+        await cache.async_get("ch-0", f"{url('ch-0')}?v=2")
+        assert fake_api.requests["logo"] == 4
+
+
+async def test_logo_view(
+    hass: HomeAssistant,
+    hass_client_no_auth: ClientSessionGenerator,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test the view serves known channel logos with a validator."""
+    assert await async_setup_component(hass, "http", {})
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.data[DOMAIN][config_entry.entry_id].async_refresh_channels()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.data[DATA_LOGO_CACHE].diagnostics()["logos"] == fake_api.channel_count
+
+    client = await hass_client_no_auth()
+
+    response = await client.get(logo_url("ch-0"))
+    assert response.status == HTTPStatus.OK
+    assert await response.read() == LOGO
+    etag = response.headers["ETag"]
+
+    response = await client.get(logo_url("ch-0"), headers={"If-None-Match": etag})
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    response = await client.get(logo_url("unknown"))
+    assert response.status == HTTPStatus.NOT_FOUND
+
+    # Prefetching downloaded every logo, the view did not add any
+    assert fake_api.requests["logo"] == fake_api.channel_count
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,167 @@
+"""Tests for the NEO Smartbox channel browser."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.media_player import (
+    ATTR_MEDIA_CONTENT_ID,
+    ATTR_MEDIA_CONTENT_TYPE,
+    DOMAIN as MEDIA_PLAYER_DOMAIN,
+    SERVICE_PLAY_MEDIA,
+    MediaType,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from custom_components.neo_smartbox.const import BROWSE_PAGE_SIZE, DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from .fake_api import CHANNEL_GROUPS, FakeNeoApi
+
+
+async def _async_setup(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> str:
+    """Set up the account and return the browser of the first box."""
+    fake_api.channel_count = 400
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        MEDIA_PLAYER_DOMAIN, DOMAIN, f"{DOMAIN}_stb-0_channels"
+    )
+    assert entity_id is not None
+    return entity_id
+
+
+async def _async_browse(
+    hass_ws_client: WebSocketGenerator, entity_id: str, content_id: str | None = None
+) -> dict[str, Any]:
+    """Browse one level of the catalogue over the websocket API."""
+    client = await hass_ws_client()
+    message: dict[str, Any] = {
+        "type": "media_player/browse_media",
+        "entity_id": entity_id,
+    }
+    if content_id is not None:
+        message["media_content_id"] = content_id
+        message["media_content_type"] = MediaType.CHANNELS
+    await client.send_json_auto_id(message)
+    response = await client.receive_json()
+    assert response["success"], response
+    return response["result"]
+
+
+async def test_device_entry(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test the browser, set up before the remote, registers the full device."""
+    entity_id = await _async_setup(hass, fake_api, config_entry)
+
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "stb-0")})
+    assert device.name == "Smartbox 0"
+    assert device.manufacturer == "Telekom Slovenia"
+    assert device.model == "NEO Smartbox"
+    assert entity_id == "media_player.smartbox_0_channels"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_browse_root(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test the root lists favourites and groups without their channels."""
+    entity_id = await _async_setup(hass, fake_api, config_entry)
+
+    root = await _async_browse(hass_ws_client, entity_id)
+
+    assert [child["title"] for child in root["children"]] == [
+        "Favourites",
+        *sorted(CHANNEL_GROUPS),
+    ]
+    assert all(child["can_expand"] for child in root["children"])
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_browse_group_pages(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test a large group is split in pages linked to each other."""
+    entity_id = await _async_setup(hass, fake_api, config_entry)
+    group_size = len(range(0, fake_api.channel_count, len(CHANNEL_GROUPS)))
+
+    first = await _async_browse(hass_ws_client, entity_id, "group:0:General")
+
+    *channels, more = first["children"]
+    assert len(channels) == BROWSE_PAGE_SIZE
+    assert channels[0]["media_content_id"] == "ch-0"
+    assert channels[0]["title"] == "1 - Channel 0"
+    assert channels[0]["thumbnail"] == f"/api/{DOMAIN}/logo/ch-0"
+    assert more["media_content_id"] == "group:1:General"
+
+    second = await _async_browse(hass_ws_client, entity_id, more["media_content_id"])
+
+    assert len(second["children"]) == group_size - BROWSE_PAGE_SIZE
+    assert all(child["can_play"] for child in second["children"])
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_browse_unknown(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test browsing an unknown id fails."""
+    entity_id = await _async_setup(hass, fake_api, config_entry)
+    client = await hass_ws_client()
+
+    await client.send_json_auto_id(
+        {
+            "type": "media_player/browse_media",
+            "entity_id": entity_id,
+            "media_content_id": "unknown",
+            "media_content_type": MediaType.CHANNELS,
+        }
+    )
+    response = await client.receive_json()
+
+    assert not response["success"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_play_channel(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test playing a channel navigates the box to it."""
+    entity_id = await _async_setup(hass, fake_api, config_entry)
+
+    await hass.services.async_call(
+        MEDIA_PLAYER_DOMAIN,
+        SERVICE_PLAY_MEDIA,
+        {
+            ATTR_ENTITY_ID: entity_id,
+            ATTR_MEDIA_CONTENT_ID: "ch-5",
+            ATTR_MEDIA_CONTENT_TYPE: MediaType.CHANNEL,
+        },
+        blocking=True,
+    )
+
+    assert fake_api.navigate_actions == [
+        {"device_id": "stb-0", "navigate_path": "app://player/livetv/id/ch-5"}
+    ]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,65 @@
+"""Tests for the NEO Smartbox API client."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import time
+
+import pytest
+
+from custom_components.neo_smartbox.models import (
+    NeoDeviceType,
+    NeoSmartboxApiClient,
+    PartialDeviceListError,
+)
+
+from .fake_api import DEVICE_LIST, SMART_TV_LIST, FakeNeoApi
+
+LIST_LATENCY = 0.2
+
+
+async def test_get_all_devices(
+    fake_api: FakeNeoApi, api_client: NeoSmartboxApiClient
+) -> None:
+    """Test the devices of both lists are returned."""
+    devices = await api_client.get_all_devices()
+
+    assert [device.id for device in devices] == fake_api.device_ids
+
+
+async def test_get_all_devices_concurrent(
+    fake_api: FakeNeoApi, api_client: NeoSmartboxApiClient
+) -> None:
+    """Test both device lists cost a single round trip of wall-clock time."""
+    fake_api.endpoint_latency = {
+        DEVICE_LIST: LIST_LATENCY,
+        SMART_TV_LIST: LIST_LATENCY,
+    }
+
+    start = time.monotonic()
+    await api_client._get_stb_list()
+    await api_client._get_smart_tv_list()
+    sequential = time.monotonic() - start
+
+    start = time.monotonic()
+    devices = await api_client.get_all_devices()
+    concurrent = time.monotonic() - start
+
+    assert len(devices) == len(fake_api.device_ids)
+    assert sequential >= 2 * LIST_LATENCY
+    assert concurrent < 0.75 * sequential
+
+
+async def test_get_all_devices_partial(
+    fake_api: FakeNeoApi, api_client: NeoSmartboxApiClient
+) -> None:
+    """Test the successful list is kept when the other one fails."""
+    fake_api.failing[SMART_TV_LIST] = HTTPStatus.BAD_REQUEST
+
+    with pytest.raises(PartialDeviceListError) as exc_info:
+        await api_client.get_all_devices()
+
+    assert [device.id for device in exc_info.value.devices] == [
+        f"stb-{index}" for index in range(fake_api.stb_count)
+    ]
+    assert set(exc_info.value.failed) == {NeoDeviceType.SMART_TV}
@@ -0,0 +1,103 @@
+"""Tests for NEO Smartbox request scheduling."""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.neo_smartbox.models import NeoSmartboxApiClient
+from custom_components.neo_smartbox.scheduler import RequestPriority, RequestScheduler
+
+from .fake_api import FakeNeoApi
+
+RETRY_AFTER = 0.2
+
+
+async def test_waiting_requests_served_by_priority() -> None:
+    """Test waiting requests get a slot by priority, then in arrival order."""
+    scheduler = RequestScheduler(max_concurrent=1)
+    order: list[tuple[RequestPriority, int]] = []
+
+    async def _request(priority: RequestPriority, index: int) -> None:
+        async with scheduler.slot(priority):
+            order.append((priority, index))
+
+    async with scheduler.slot(RequestPriority.POLL):
+        tasks = [
+            asyncio.ensure_future(_request(priority, index))
+            for index, priority in enumerate(
+                (
+                    RequestPriority.POLL,
+                    RequestPriority.BULK,
+                    RequestPriority.INTERACTIVE,
+                    RequestPriority.POLL,
+                )
+            )
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.diagnostics()["waiting"] == 4
+
+    await asyncio.gather(*tasks)
+
+    assert order == [
+        (RequestPriority.INTERACTIVE, 2),
+        (RequestPriority.BULK, 1),
+        (RequestPriority.POLL, 0),
+        (RequestPriority.POLL, 3),
+    ]
+
+    diagnostics = scheduler.diagnostics()
+    assert diagnostics["active"] == 0
+    assert diagnostics["interactive"]["requests"] == 1
+    assert diagnostics["poll"]["requests"] == 3
+
+
+async def test_concurrency_limit() -> None:
+    """Test no more requests than allowed hold a slot at once."""
+    scheduler = RequestScheduler(max_concurrent=2)
+    active = peak = 0
+
+    async def _request() -> None:
+        nonlocal active, peak
+        async with scheduler.slot(RequestPriority.BULK):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(_request() for _ in range(6)))
+
+    assert peak == 2
+
+
+async def test_cancelled_waiter_gives_up_its_turn() -> None:
+    """Test a cancelled waiting request does not keep a slot."""
+    scheduler = RequestScheduler(max_concurrent=1)
+    served: list[str] = []
+
+    async def _request(name: str) -> None:
+        async with scheduler.slot(RequestPriority.BULK):
+            served.append(name)
+
+    async with scheduler.slot(RequestPriority.BULK):
+        cancelled = asyncio.ensure_future(_request("cancelled"))
+        waiting = asyncio.ensure_future(_request("waiting"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+    await asyncio.gather(cancelled, waiting, return_exceptions=True)
+
+    assert served == ["waiting"]
+    assert scheduler.diagnostics()["active"] == 0
+
+
+async def test_token_wait_counted(
+    fake_api: FakeNeoApi, api_client: NeoSmartboxApiClient
+) -> None:
+    """Test the wait for a rate limiter token is part of the recorded wait."""
+    api_client.rate_limiter.record_throttled(RETRY_AFTER)
+
+    await api_client.get_channel_list()
+
+    diagnostics = api_client.scheduler.diagnostics()["poll"]
+    assert diagnostics["requests"] == 1
+    assert diagnostics["max_wait_ms"] >= RETRY_AFTER * 1000
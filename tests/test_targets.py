@@ -0,0 +1,67 @@
+"""Tests for NEO Smartbox service target resolution."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from custom_components.neo_smartbox import get_devices_from_target
+from custom_components.neo_smartbox.const import DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .fake_api import FakeNeoApi
+
+
+async def test_resolve_targets(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test devices, entities and areas resolve to NEO device ids."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    stb = device_registry.async_get_device(identifiers={(DOMAIN, "stb-0")})
+    tv = device_registry.async_get_device(identifiers={(DOMAIN, "tv-0")})
+    tv_remote = next(
+        entry.entity_id
+        for entry in er.async_entries_for_device(entity_registry, tv.id)
+        if entry.domain == "remote"
+    )
+
+    assert get_devices_from_target(hass, {"device_id": [stb.id]}) == ["stb-0"]
+    assert get_devices_from_target(hass, {"entity_id": [tv_remote]}) == ["tv-0"]
+    assert get_devices_from_target(
+        hass, {"device_id": [stb.id, "unknown"], "entity_id": [tv_remote]}
+    ) == ["stb-0", "tv-0"]
+
+    area = ar.async_get(hass).async_create("Living room")
+    device_registry.async_update_device(stb.id, area_id=area.id)
+    await hass.async_block_till_done()
+
+    assert get_devices_from_target(hass, {"area_id": [area.id]}) == ["stb-0"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_index_follows_registry(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test the index is updated when a device is removed."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    device_registry = dr.async_get(hass)
+    stb = device_registry.async_get_device(identifiers={(DOMAIN, "stb-1")})
+
+    device_registry.async_remove_device(stb.id)
+    await hass.async_block_till_done()
+
+    assert get_devices_from_target(hass, {"device_id": [stb.id]}) == []
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,101 @@
+"""Tests for NEO Smartbox rate limiting and the circuit breaker."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.neo_smartbox.const import (
+    BREAKER_FAILURE_THRESHOLD,
+    RATE_LIMIT_MAX_RATE,
+)
+from custom_components.neo_smartbox.throttle import (
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("5", 5.0),
+        ("-3", 0.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        ("soon", None),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    """Test Retry-After headers in seconds and as a date."""
+    assert parse_retry_after(value) == expected
+
+
+async def test_rate_limiter_backs_off() -> None:
+    """Test a 429 halves the rate and pauses requests for Retry-After."""
+    limiter = AdaptiveRateLimiter()
+    await limiter.async_acquire()
+
+    limiter.record_throttled(0.05)
+    start = time.monotonic()
+    await limiter.async_acquire()
+
+    assert time.monotonic() - start >= 0.05
+    assert limiter.rate == RATE_LIMIT_MAX_RATE / 2
+    assert limiter.diagnostics()["throttled_responses"] == 1
+    assert limiter.diagnostics()["delayed_requests"] == 1
+
+    limiter.record_success()
+    assert limiter.rate > RATE_LIMIT_MAX_RATE / 2
+
+
+def test_breaker_opens_after_failures() -> None:
+    """Test the breaker rejects requests after consecutive failures."""
+    breaker = CircuitBreaker()
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.rejected_requests == 1
+
+
+def test_breaker_success_resets_failures() -> None:
+    """Test a success in between keeps the breaker closed."""
+    breaker = CircuitBreaker()
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.check()
+
+
+def test_breaker_trial_after_open_period() -> None:
+    """Test a trial request after the open period closes or reopens it."""
+    breaker = CircuitBreaker()
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+    with patch("custom_components.neo_smartbox.throttle.BREAKER_OPEN_SECONDS", 0):
+        breaker.check()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        breaker.check()
+        breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
@@ -0,0 +1,75 @@
+"""Tests for the NEO Smartbox HTTP transport."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.neo_smartbox.const import DATA_TRANSPORT
+from custom_components.neo_smartbox.scheduler import RequestPriority
+from custom_components.neo_smartbox.throttle import CircuitBreaker
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .fake_api import FakeNeoApi
+
+
+async def _async_keep_warm(hass: HomeAssistant) -> None:
+    """Run the keep-warm check as if the connection had been idle."""
+    with patch(
+        "custom_components.neo_smartbox.transport.TRANSPORT_WARM_UP_INTERVAL", 0
+    ):
+        await hass.data[DATA_TRANSPORT]._async_keep_warm()
+
+
+async def test_warm_up_after_interactive_request(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test connections are only kept warm after an interactive request."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    transport = hass.data[DATA_TRANSPORT]
+    coordinator = config_entry.runtime_data
+
+    # Polling alone does not keep a connection warm
+    await _async_keep_warm(hass)
+    assert fake_api.requests["ping"] == 0
+
+    assert await coordinator.async_send_key(
+        "stb-0", "OK", priority=RequestPriority.INTERACTIVE
+    )
+    requests = transport.diagnostics()["requests"]
+
+    await _async_keep_warm(hass)
+    assert fake_api.requests["ping"] == 1
+
+    diagnostics = transport.diagnostics()
+    assert diagnostics["warm_ups"] == 1
+    assert diagnostics["requests"] == requests
+
+    # Not after the window
+    with patch("custom_components.neo_smartbox.transport.TRANSPORT_WARM_UP_WINDOW", 0):
+        await _async_keep_warm(hass)
+    assert fake_api.requests["ping"] == 1
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_no_warm_up_while_breaker_open(
+    hass: HomeAssistant, fake_api: FakeNeoApi, config_entry: MockConfigEntry
+) -> None:
+    """Test no warm-up is sent while the API is failing."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = config_entry.runtime_data
+
+    assert await coordinator.async_send_key(
+        "stb-0", "OK", priority=RequestPriority.INTERACTIVE
+    )
+    coordinator.api_client.circuit_breaker.state = CircuitBreaker.OPEN
+
+    await _async_keep_warm(hass)
+    assert fake_api.requests["ping"] == 0
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,80 @@
+"""Tests for the NEO Smartbox websocket commands."""
+
+from __future__ import annotations
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant
+
+from custom_components.neo_smartbox.const import DOMAIN
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from .fake_api import FakeNeoApi
+
+
+async def test_press(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test a press is sent to the device."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/press", "device_id": "stb-0", "key": "ok"}
+    )
+    response = await client.receive_json()
+
+    assert response["success"]
+    assert response["result"]["success"]
+    assert [action["key_name"] for action in fake_api.key_actions] == ["Select"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_press_unknown_device(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test a press for an unknown device fails."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/press", "device_id": "unknown", "key": "ok"}
+    )
+    response = await client.receive_json()
+
+    assert response["error"]["code"] == websocket_api.ERR_NOT_FOUND
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_press_needs_control_permission(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    hass_read_only_access_token: str,
+    fake_api: FakeNeoApi,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test a user without control permission on the remote cannot press."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass, hass_read_only_access_token)
+
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/press", "device_id": "stb-0", "key": "ok"}
+    )
+    response = await client.receive_json()
+
+    assert response["error"]["code"] == websocket_api.ERR_UNAUTHORIZED
+    assert fake_api.key_actions == []
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)